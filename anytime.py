@@ -0,0 +1,118 @@
+import threading
+import time
+from instrument import SolveStats
+from solver import ENGINES, greedy_crossing_with_path, dp_plans, escort_crossing_with_path, crossing_lower_bound
+
+class _Stop(Exception):
+    pass
+
+class AnytimeSolver:
+    # works on a background thread: publishes a quick plan first (the escort
+    # heuristic) and improves it with the DP until it is proven optimal, the
+    # time or node budget runs out, or cancel() is called. Only a finished
+    # run of an engine registered as exact proves a plan optimal; until then
+    # lower_bound is crossing_lower_bound.
+    # Callers poll snapshot() or pass on_update, which runs on that thread.
+    def __init__(self, times, max_group, time_budget=None, node_budget=None, on_update=None):
+        self.times = list(times)
+        self.max_group = max_group
+        self.time_budget = time_budget
+        self.node_budget = node_budget
+        self.on_update = on_update
+        self.stats = SolveStats(progress=self._progress, every=256)
+        self.lock = threading.Lock()
+        self.cancelled = threading.Event()
+        self.planned = threading.Event()
+        self.finished = threading.Event()
+        self.thread = None
+        self.deadline = None
+        self.expanded = 0
+        self.total = None
+        self.steps = []
+        self.lower_bound = None
+        self.optimal = False
+
+    def start(self):
+        if self.time_budget is not None:
+            self.deadline = time.monotonic() + self.time_budget
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        return self
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def wait(self, timeout=None):
+        return self.finished.wait(timeout)
+
+    def wait_for_plan(self, timeout=None):
+        return self.planned.wait(timeout)
+
+    @property
+    def done(self):
+        return self.finished.is_set()
+
+    @property
+    def gap(self):
+        # relative distance between the best plan and the proven lower bound
+        with self.lock:
+            if self.total is None or self.lower_bound is None:
+                return None
+            if self.optimal or not self.total:
+                return 0.0
+            return (self.total - self.lower_bound) / self.total
+
+    def snapshot(self):
+        with self.lock:
+            return {"total": self.total, "steps": self.steps, "lower_bound": self.lower_bound,
+                    "optimal": self.optimal, "done": self.finished.is_set(), "expanded": self.expanded}
+
+    def _progress(self, expanded, bound):
+        self.expanded = expanded
+        if self.cancelled.is_set():
+            raise _Stop
+        if self.node_budget is not None and expanded >= self.node_budget:
+            raise _Stop
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            raise _Stop
+
+    def _run(self):
+        try:
+            if self.max_group == 2:
+                total, steps = greedy_crossing_with_path(self.times, self.stats)
+                with self.lock:
+                    self.total, self.steps = total, steps
+                    if ENGINES["greedy"].exact:
+                        self.lower_bound = total
+                        self.optimal = total is not None
+                    else:
+                        self.lower_bound = crossing_lower_bound(self.times, self.max_group)
+                return
+            total, steps = escort_crossing_with_path(self.times, self.max_group)
+            lower_bound = crossing_lower_bound(self.times, self.max_group)
+            with self.lock:
+                self.total, self.steps, self.lower_bound = total, steps, lower_bound
+            self.planned.set()
+            self._notify()
+            for total, steps in dp_plans(self.times, self.max_group, self.stats):
+                with self.lock:
+                    if self.total is None or total < self.total:
+                        self.total, self.steps = total, steps
+                self._notify()
+            with self.lock:
+                if self.total is not None and ENGINES["dp"].exact:
+                    self.optimal = True
+                    self.lower_bound = self.total
+        except _Stop:
+            pass
+        finally:
+            self.planned.set()
+            self.finished.set()
+            self._notify()
+
+    def _notify(self):
+        if self.on_update is not None:
+            self.on_update(self)
+
+def solve_anytime(times, max_group, time_budget=None, node_budget=None, on_update=None):
+    return AnytimeSolver(times, max_group, time_budget, node_budget, on_update).start()
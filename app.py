@@ -1,62 +1,16 @@
-import heapq
-import itertools
 import tkinter as tk
 from tkinter import ttk, messagebox
 from graphics import BridgeGraphics
-
-def min_crossing_with_path(times, max_group):
-    n = len(times)
-    ALL = (1 << n) - 1
-    start = (ALL, 0)
-    target = (0, 1)
-    pq = [(0, start)]
-    dist = {start: 0}
-    prev = {}
-    while pq:
-        cost, (mask, side) = heapq.heappop(pq)
-        if dist.get((mask, side), float('inf')) < cost:
-            continue
-        if (mask, side) == target:
-            path = []
-            cur = target
-            while cur != start:
-                p = prev[cur]
-                path.append(p[1])
-                cur = p[0]
-            path.reverse()
-            steps = []
-            cur_mask = ALL
-            cur_side = 0
-            for group in path:
-                t = max(times[i] for i in group)
-                direction = "->" if cur_side == 0 else "<-"
-                participants = [i for i in group]
-                steps.append((participants, direction, t))
-                for i in group:
-                    cur_mask ^= (1 << i)
-                cur_side = 1 - cur_side
-            return dist[target], steps
-        torch_side_people = []
-        for i in range(n):
-            on_start = ((mask >> i) & 1) == 1
-            if (side == 0 and on_start) or (side == 1 and not on_start):
-                torch_side_people.append(i)
-        for k in range(1, min(max_group, len(torch_side_people)) + 1):
-            for group in itertools.combinations(torch_side_people, k):
-                t = max(times[i] for i in group)
-                new_mask = mask
-                for i in group:
-                    new_mask ^= (1 << i)
-                new_side = 1 - side
-                new_state = (new_mask, new_side)
-                new_cost = cost + t
-                if new_cost < dist.get(new_state, float('inf')):
-                    dist[new_state] = new_cost
-                    prev[new_state] = ((mask, side), group)
-                    heapq.heappush(pq, (new_cost, new_state))
-    return None, []
+from cache import SolutionCache
+from instrument import format_stats
+from anytime import AnytimeSolver
 
 class App:
+    # seconds the background solver may spend improving a plan
+    SOLVE_BUDGET = 60
+    # how often the Tk loop checks on the solver
+    POLL_MS = 100
+
     def __init__(self, root):
         self.root = root
         root.title("Bridge & Torch — Animated")
@@ -73,11 +27,23 @@ class App:
         self.entry_max.grid(column=0, row=5, sticky="w", pady=(0,6))
         compute_btn = ttk.Button(frm, text="Compute & Animate", command=self.on_compute)
         compute_btn.grid(column=1, row=3, padx=8)
+        self.cancel_btn = ttk.Button(frm, text="Cancel", command=self.on_cancel, state="disabled")
+        self.cancel_btn.grid(column=1, row=5, padx=8)
+        self.progress = ttk.Progressbar(frm, mode="indeterminate", length=120)
+        self.progress.grid(column=1, row=4, padx=8)
         self.result_var = tk.StringVar(value="")
         ttk.Label(frm, textvariable=self.result_var, font=("Segoe UI", 10, "bold")).grid(column=0, row=6, columnspan=2, sticky="w", pady=(8,0))
+        self.stats_var = tk.StringVar(value="")
+        ttk.Label(frm, textvariable=self.stats_var, font=("Segoe UI", 9)).grid(column=0, row=7, columnspan=2, sticky="w")
         self.steps_text = tk.Text(frm, width=60, height=8, state="disabled")
-        self.steps_text.grid(column=0, row=7, columnspan=2, pady=(6,0))
+        self.steps_text.grid(column=0, row=8, columnspan=2, pady=(6,0))
         self.graphics = BridgeGraphics(root)
+        self.cache = SolutionCache()
+        self.solver = None
+        self.solving = None
+        self.shown = None
+        self.start_id = None
+        root.protocol("WM_DELETE_WINDOW", self.on_close)
 
     def on_compute(self):
         if self.graphics.animation_in_progress:
@@ -109,7 +75,70 @@ class App:
         except:
             messagebox.showerror("Input error", "Enter a valid max crossing size.")
             return
-        total, steps = min_crossing_with_path(times, max_group)
+        if self.solver is not None:
+            # the earlier solve's poll stops once self.solver moves on, so
+            # its widgets are reset here
+            self.solver.cancel()
+            self.solver = None
+            self.stop_progress()
+        cached = self.cache.get(times, max_group)
+        if cached is not None:
+            total, steps = cached
+            self.stats_var.set(format_stats({"cache_hit": True}))
+            self.show_plan(times, total, steps)
+            self.animate(times, total, steps)
+            return
+        # solve on a worker thread and poll it from the Tk loop; the best
+        # plan so far is animated as soon as there is one
+        self.solving = (times, max_group)
+        self.shown = None
+        self.result_var.set("Solving...")
+        self.stats_var.set("")
+        self.progress.start(15)
+        self.cancel_btn.config(state="normal")
+        solver = AnytimeSolver(times, max_group, time_budget=self.SOLVE_BUDGET).start()
+        self.solver = solver
+        self.root.after(self.POLL_MS, lambda: self.poll_solver(solver))
+
+    def poll_solver(self, solver):
+        if solver is not self.solver:
+            return
+        snap = solver.snapshot()
+        times = self.solving[0]
+        if snap["total"] is not None and snap["total"] != self.shown:
+            # a better plan replaces the listed one and restarts the
+            # animation, so the canvas always plays the plan shown
+            self.shown = snap["total"]
+            self.show_plan(times, snap["total"], snap["steps"])
+            self.animate(times, snap["total"], snap["steps"])
+        if snap["total"] is not None and not snap["optimal"]:
+            gap = solver.gap
+            label = "Best total time so far" if not snap["done"] else "Best total time found"
+            self.result_var.set(f"{label}: {snap['total']} (lower bound {snap['lower_bound']}, gap {gap:.1%})")
+        if snap["done"]:
+            self.finish_solve(solver, snap)
+            return
+        best = snap["total"] if snap["total"] is not None else "-"
+        self.stats_var.set(f"Solving... {snap['expanded']} states expanded, best cost {best}")
+        self.root.after(self.POLL_MS, lambda: self.poll_solver(solver))
+
+    def finish_solve(self, solver, snap):
+        self.stop_progress()
+        self.stats_var.set(format_stats(solver.stats))
+        if snap["total"] is None:
+            self.result_var.set("No solution.")
+        elif snap["optimal"]:
+            times, max_group = self.solving
+            self.result_var.set(f"Minimal total time: {snap['total']}")
+            self.cache.put(times, max_group, snap["total"], snap["steps"])
+        self.solver = None
+
+    def stop_progress(self):
+        self.progress.stop()
+        self.cancel_btn.config(state="disabled")
+        self.stats_var.set("")
+
+    def show_plan(self, times, total, steps):
         if total is None:
             self.result_var.set("No solution.")
             return
@@ -120,8 +149,26 @@ class App:
             participants = ", ".join(f"P{g+1}({times[g]})" for g in group)
             self.steps_text.insert("end", f"Step {i}: {participants} {direction} time {t}\n")
         self.steps_text.config(state="disabled")
+
+    def animate(self, times, total, steps):
+        if total is None:
+            return
+        if self.start_id is not None:
+            self.root.after_cancel(self.start_id)
         self.graphics.prepare_canvas(times)
-        self.root.after(300, lambda: self.graphics.animate_steps(steps, times))
+        self.start_id = self.root.after(300, lambda: self.start_animation(steps, times))
+
+    def start_animation(self, steps, times):
+        self.start_id = None
+        self.graphics.animate_steps(steps, times)
+
+    def on_cancel(self):
+        if self.solver is not None:
+            self.solver.cancel()
+
+    def on_close(self):
+        self.on_cancel()
+        self.root.destroy()
 
 if __name__ == "__main__":
     root = tk.Tk()
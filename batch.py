@@ -0,0 +1,53 @@
+import os
+from solver import min_crossing_with_path
+
+def solve_batch(instances, workers=None, chunksize=16, solver=min_crossing_with_path):
+    # solve (times, max_group) pairs across worker processes and yield
+    # (index, total, steps) in the order they finish
+    for index, (total, steps) in map_batch(solver, instances, workers, chunksize):
+        yield index, total, steps
+
+def map_batch(func, items, workers=None, chunksize=16):
+    # call func(*item) for every item across worker processes and yield
+    # (index, result) in the order they finish. Items are read lazily, with
+    # a bounded number of chunks in flight. func must be picklable.
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for index, item in enumerate(items):
+            yield index, func(*item)
+        return
+    # imported here: the process pool machinery roughly doubles the import
+    # time of everything that uses this module
+    from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+    chunks = _chunks(items, chunksize)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for _ in range(workers * 2):
+            chunk = next(chunks, None)
+            if chunk is None:
+                break
+            pending.add(pool.submit(_run_chunk, func, *chunk))
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                for result in future.result():
+                    yield result
+                chunk = next(chunks, None)
+                if chunk is not None:
+                    pending.add(pool.submit(_run_chunk, func, *chunk))
+
+def _chunks(items, chunksize):
+    chunk = []
+    start = 0
+    for index, item in enumerate(items):
+        if not chunk:
+            start = index
+        chunk.append(item)
+        if len(chunk) == chunksize:
+            yield start, chunk
+            chunk = []
+    if chunk:
+        yield start, chunk
+
+def _run_chunk(func, start, chunk):
+    return [(start + offset, func(*item)) for offset, item in enumerate(chunk)]
@@ -0,0 +1,225 @@
+import argparse
+import heapq
+import itertools
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+import solver
+from solver import min_crossing_with_path
+
+def reference_crossing_with_path(times, max_group, stats=None):
+    # the original subset Dijkstra, before the group-time table, bitmask move
+    # generation and equal-time canonicalisation; kept as the baseline the
+    # search engines' throughput is measured against
+    n = len(times)
+    ALL = (1 << n) - 1
+    start = (ALL, 0)
+    target = (0, 1)
+    pq = [(0, start)]
+    dist = {start: 0}
+    prev = {}
+    expanded = pushed = 0
+    while pq:
+        cost, (mask, side) = heapq.heappop(pq)
+        if dist.get((mask, side), float('inf')) < cost:
+            continue
+        if (mask, side) == target:
+            break
+        expanded += 1
+        torch_side_people = [i for i in range(n) if ((mask >> i) & 1) == (side == 0)]
+        for k in range(1, min(max_group, len(torch_side_people)) + 1):
+            for group in itertools.combinations(torch_side_people, k):
+                t = max(times[i] for i in group)
+                new_mask = mask
+                for i in group:
+                    new_mask ^= (1 << i)
+                new_state = (new_mask, 1 - side)
+                new_cost = cost + t
+                if new_cost < dist.get(new_state, float('inf')):
+                    dist[new_state] = new_cost
+                    prev[new_state] = ((mask, side), group)
+                    heapq.heappush(pq, (new_cost, new_state))
+                    pushed += 1
+    if stats is not None:
+        stats["expanded"] = expanded
+        stats["pushed"] = pushed
+    if target not in dist:
+        return None, []
+    path = []
+    cur = target
+    while cur != start:
+        cur, group = prev[cur]
+        path.append(group)
+    path.reverse()
+    return dist[target], [(list(group), "->" if k % 2 == 0 else "<-", max(times[i] for i in group))
+                          for k, group in enumerate(path)]
+
+ENGINES = dict({"auto": solver.Engine("auto", min_crossing_with_path, None),
+                "reference": solver.Engine("reference", reference_crossing_with_path, None)},
+               **solver.ENGINES)
+
+# largest n each engine is swept to by default; the subset searches are exponential
+# and the DP grows with n squared
+MAX_N = {"auto": 100, "greedy": 100000, "dp": 100, "astar": 14, "dijkstra": 13, "reference": 13,
+         "bidirectional": 13, "bidirectional_astar": 14, "escort": 100000}
+
+# modules timed by the startup benchmark, and modules none of them should load
+STARTUP_MODULES = ("solver", "cache", "cli", "batch", "service", "render")
+HEAVY_MODULES = ("tkinter", "numpy", "asyncio", "concurrent.futures.process")
+
+def make_times(dist, n, rng):
+    if dist == "random":
+        return [rng.randint(1, 1000) for _ in range(n)]
+    if dist == "uniform":
+        times = [1 + i * 100 // max(n, 1) for i in range(n)]
+        rng.shuffle(times)
+        return times
+    if dist == "skewed":
+        # mostly fast people with a long tail of slow ones
+        return [1 + int(rng.expovariate(0.1)) for _ in range(n)]
+    if dist == "duplicates":
+        return [rng.choice((1, 2, 5, 10)) for _ in range(n)]
+    raise ValueError(f"unknown distribution: {dist}")
+
+def run(engines, dists, sizes, groups, seed=0, repeat=3, memory=True, max_n=None):
+    results = []
+    for engine in engines:
+        solve = ENGINES[engine].solve
+        for dist in dists:
+            for n in sizes:
+                if n > (max_n or MAX_N[engine]):
+                    continue
+                for max_group in groups:
+                    if not ENGINES[engine].accepts(n, max_group):
+                        continue
+                    times = make_times(dist, n, random.Random(f"{seed}-{dist}-{n}"))
+                    best = None
+                    for _ in range(repeat):
+                        stats = {}
+                        start = time.perf_counter()
+                        total, steps = solve(times, max_group, stats)
+                        elapsed = time.perf_counter() - start
+                        best = elapsed if best is None else min(best, elapsed)
+                    peak = None
+                    if memory:
+                        # separate pass: tracing slows the solver down a lot
+                        tracemalloc.start()
+                        solve(times, max_group, {})
+                        peak = tracemalloc.get_traced_memory()[1]
+                        tracemalloc.stop()
+                    expanded = stats.get("expanded")
+                    rate = expanded / best if expanded and best else None
+                    result = {"engine": engine, "dist": dist, "n": n, "max_group": max_group,
+                              "total": total, "trips": len(steps), "seconds": best,
+                              "expanded": expanded, "pushed": stats.get("pushed"),
+                              "expanded_per_s": rate, "peak_bytes": peak}
+                    results.append(result)
+                    print(f"{engine:9} {dist:10} n={n:<6} c={max_group:<3} total={total} "
+                          f"{best * 1000:10.2f} ms  expanded={result['expanded']}  pushed={result['pushed']}"
+                          + (f"  {rate / 1000:.1f}k states/s" if rate else "")
+                          + (f"  peak={peak / 1024:.0f} KiB" if peak is not None else ""), file=sys.stderr)
+    return results
+
+def startup(modules, repeat=10):
+    # cold import time of each module, in a fresh interpreter every time so
+    # nothing is cached in sys.modules, less that of an empty interpreter.
+    # Also reports which heavy modules the import pulled in. The interpreters
+    # run from this file's directory, where the modules live.
+    here = os.path.dirname(os.path.abspath(__file__))
+    probe = ("import sys, time; t = time.perf_counter(); {}; t = time.perf_counter() - t; "
+             "print(t, *[m for m in %r if m in sys.modules])" % (HEAVY_MODULES,))
+    def best(statement):
+        times = []
+        for _ in range(repeat):
+            out = subprocess.run([sys.executable, "-c", probe.format(statement)], cwd=here,
+                                 capture_output=True, text=True, check=True).stdout.split()
+            times.append(float(out[0]))
+        return min(times), out[1:]
+    baseline, _ = best("pass")
+    results = []
+    for module in modules:
+        seconds, loaded = best(f"import {module}")
+        results.append({"module": module, "seconds": seconds - baseline, "loaded": loaded})
+        print(f"{module:12} {(seconds - baseline) * 1000:8.2f} ms  " + (" ".join(loaded) or "-"), file=sys.stderr)
+    return results
+
+def compare(old, new, threshold=0.2, floor=0.001):
+    # pair up runs by configuration and report time and search effort changes;
+    # returns the number of regressions: a different total, or a slowdown
+    # beyond threshold on a run long enough (floor seconds) to time reliably
+    key = lambda r: (r["engine"], r["dist"], r["n"], r["max_group"])
+    before = {key(r): r for r in old["results"]}
+    regressions = 0
+    for r in new["results"]:
+        o = before.get(key(r))
+        if o is None:
+            continue
+        ratio = r["seconds"] / o["seconds"] if o["seconds"] else float("inf")
+        flags = []
+        if r["total"] != o["total"]:
+            flags.append(f"TOTAL {o['total']} -> {r['total']}")
+        if ratio > 1 + threshold and r["seconds"] >= floor:
+            flags.append("SLOWER")
+        if flags:
+            regressions += 1
+        if o["expanded"] is not None and r["expanded"] is not None and r["expanded"] != o["expanded"]:
+            flags.append(f"expanded {o['expanded']} -> {r['expanded']}")
+        print(f"{r['engine']:9} {r['dist']:10} n={r['n']:<6} c={r['max_group']:<3} "
+              f"{o['seconds'] * 1000:10.2f} -> {r['seconds'] * 1000:10.2f} ms  x{ratio:.2f}  " + " ".join(flags))
+    print(f"{regressions} regression(s)")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the bridge and torch solvers.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    run_p = sub.add_parser("run", help="sweep n and max_group and write JSON results")
+    run_p.add_argument("--engines", default="auto,dp,astar,dijkstra")
+    run_p.add_argument("--dists", default="random,uniform,skewed,duplicates")
+    run_p.add_argument("--sizes", default="4,8,10,12,13,50,200,1000")
+    run_p.add_argument("--groups", default="2,3,4")
+    run_p.add_argument("--seed", type=int, default=0)
+    run_p.add_argument("--repeat", type=int, default=3)
+    run_p.add_argument("--max-n", type=int, help="override the per-engine size cap")
+    run_p.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    run_p.add_argument("-o", "--output", default="bench_results.json")
+    cmp_p = sub.add_parser("compare", help="diff two result files")
+    cmp_p.add_argument("old")
+    cmp_p.add_argument("new")
+    cmp_p.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown ratio")
+    cmp_p.add_argument("--floor", type=float, default=0.001, help="ignore slowdowns on runs faster than this many seconds")
+    start_p = sub.add_parser("startup", help="time cold imports of the command-line modules")
+    start_p.add_argument("--modules", default=",".join(STARTUP_MODULES))
+    start_p.add_argument("--repeat", type=int, default=10)
+    start_p.add_argument("-o", "--output", help="also write JSON results here")
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        split = lambda s: [x.strip() for x in s.split(",") if x.strip()]
+        results = run(split(args.engines), split(args.dists), [int(x) for x in split(args.sizes)],
+                      [int(x) for x in split(args.groups)], args.seed, args.repeat,
+                      not args.no_memory, args.max_n)
+        meta = {"python": platform.python_version(), "platform": platform.platform(),
+                "seed": args.seed, "repeat": args.repeat}
+        with open(args.output, "w") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=1)
+    elif args.command == "startup":
+        results = startup([m.strip() for m in args.modules.split(",") if m.strip()], args.repeat)
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump({"meta": {"python": platform.python_version(), "platform": platform.platform()},
+                           "results": results}, f, indent=1)
+    else:
+        with open(args.old) as f:
+            old = json.load(f)
+        with open(args.new) as f:
+            new = json.load(f)
+        if compare(old, new, args.threshold, args.floor):
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
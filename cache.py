@@ -0,0 +1,112 @@
+import json
+import sqlite3
+from collections import OrderedDict
+from solver import min_crossing_with_path
+
+class SolutionCache:
+    # solutions keyed by the sorted time multiset and max_group; steps are
+    # stored by sorted position and mapped back to the caller's people on a hit.
+    # The key also marks which sorted positions hold floats, so [1, 2] and
+    # [1.0, 2.0] don't share an entry and each gets its own types back.
+    def __init__(self, maxsize=256, path=None, solver=min_crossing_with_path):
+        self.maxsize = maxsize
+        self.solver = solver
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.db = None
+        if path is not None:
+            self.db = sqlite3.connect(path)
+            self.db.execute("CREATE TABLE IF NOT EXISTS solutions (key TEXT PRIMARY KEY, total REAL, steps TEXT)")
+            self.db.commit()
+
+    def solve(self, times, max_group, stats=None):
+        cached = self.get(times, max_group)
+        if cached is not None:
+            if stats is not None:
+                stats["cache_hit"] = True
+            return cached
+        total, steps = self.solver(list(times), max_group, stats)
+        self.put(times, max_group, total, steps)
+        return total, steps
+
+    def get(self, times, max_group):
+        order = _order(times)
+        entry = self.lookup(_key(times, order, max_group))
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        total, steps = entry
+        return total, [(sorted(order[p] for p in group), direction, t) for group, direction, t in steps]
+
+    def key(self, times, max_group):
+        # the entry any permutation of these times shares
+        return _key(times, _order(times), max_group)
+
+    def put(self, times, max_group, total, steps):
+        # steps name the caller's people; store them by sorted position
+        order = _order(times)
+        position = {person: p for p, person in enumerate(order)}
+        key = _key(times, order, max_group)
+        self.store(key, (total, [(tuple(sorted(position[i] for i in group)), direction, t)
+                                 for group, direction, t in steps]))
+
+    def lookup(self, key):
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            return entry
+        if self.db is None:
+            return None
+        row = self.db.execute("SELECT total, steps FROM solutions WHERE key = ?", (_db_key(key),)).fetchone()
+        if row is None:
+            return None
+        steps = [(tuple(group), direction, t) for group, direction, t in json.loads(row[1])]
+        total = row[0]
+        # the total column is REAL; the step times kept their types in JSON
+        if total is not None and all(isinstance(t, int) for _, _, t in steps):
+            total = int(total)
+        entry = (total, steps)
+        self.remember(key, entry)
+        return entry
+
+    def store(self, key, entry):
+        self.remember(key, entry)
+        if self.db is not None:
+            total, steps = entry
+            self.db.execute("INSERT OR REPLACE INTO solutions VALUES (?, ?, ?)",
+                            (_db_key(key), total, json.dumps([list(step) for step in steps])))
+            self.db.commit()
+
+    def remember(self, key, entry):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+        if self.db is not None:
+            self.db.execute("DELETE FROM solutions")
+            self.db.commit()
+
+    def close(self):
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+
+def _order(times):
+    return sorted(range(len(times)), key=lambda i: times[i])
+
+def _key(times, order, max_group):
+    # (sorted times, max_group, bitmask of the sorted positions holding floats)
+    floats = 0
+    for p, i in enumerate(order):
+        if isinstance(times[i], float):
+            floats |= 1 << p
+    return tuple(times[i] for i in order), max_group, floats
+
+def _db_key(key):
+    times, max_group, floats = key
+    return json.dumps([list(times), max_group, floats])
@@ -0,0 +1,81 @@
+import argparse
+import csv
+import json
+import sys
+from batch import solve_batch
+from instances import number, parse_record, validate
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve bridge and torch instances without the GUI.")
+    parser.add_argument("input", nargs="?", default="-", help="JSONL or CSV file of instances, - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="where to write JSONL solutions, - for stdout")
+    parser.add_argument("-f", "--format", choices=["jsonl", "csv"], help="input format (default: from the file extension, else jsonl)")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="worker processes (default: 1, solve in-process)")
+    parser.add_argument("--chunksize", type=int, default=16, help="instances per worker task")
+    args = parser.parse_args(argv)
+
+    fmt = args.format
+    if fmt is None:
+        fmt = "csv" if args.input.lower().endswith(".csv") else "jsonl"
+    src = sys.stdin if args.input == "-" else open(args.input, newline="")
+    out = sys.stdout if args.output == "-" else open(args.output, "w")
+    try:
+        run(src, out, fmt, args.workers, args.chunksize)
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if out is not sys.stdout:
+            out.close()
+
+def run(src, out, fmt, workers=1, chunksize=16):
+    # line index of every instance handed to the solver and not yet answered;
+    # it only ever holds what is in flight, so memory stays flat
+    pending = {}
+
+    def instances():
+        submitted = 0
+        for index, instance, error in read_csv(src) if fmt == "csv" else read_jsonl(src):
+            if error is not None:
+                write(out, {"index": index, "error": error})
+                continue
+            pending[submitted] = index
+            submitted += 1
+            yield instance
+
+    for batch_index, total, steps in solve_batch(instances(), workers=workers, chunksize=chunksize):
+        write(out, {"index": pending.pop(batch_index), "total": total, "steps": [
+            {"people": group, "direction": direction, "time": t} for group, direction, t in steps]})
+
+def read_jsonl(src):
+    index = 0
+    for line in src:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        try:
+            yield index, parse_record(json.loads(line)), None
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            yield index, None, f"bad instance: {e}"
+        index += 1
+
+def read_csv(src):
+    # each row is the times followed by max_group; a quoted first field may
+    # hold the whole comma-separated times list, as typed into the GUI
+    index = 0
+    for row in csv.reader(src):
+        if not "".join(row).strip() or row[0].lstrip().startswith("#"):
+            continue
+        try:
+            times = [number(x) for field in row[:-1] for x in field.split(",") if x.strip()]
+            yield index, validate(times, int(row[-1])), None
+        except ValueError as e:
+            if index == 0 and not any(c.isdigit() for c in row[-1]):
+                continue  # header line
+            yield index, None, f"bad instance: {e}"
+        index += 1
+
+def write(out, record):
+    out.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# plans are uint64 bitmasks, so the vectorised path covers up to 64 people
+MAX_PEOPLE = 64
+# plans evaluated together; small enough for the working arrays to stay in cache
+BLOCK = 1 << 14
+# masks are split into slices this wide for the time and size lookups
+CHUNK_BITS = 16
+
+def encode_plans(plans, length=None):
+    # solver-style plans (lists of (people, direction, time) steps) as a
+    # (plans, steps) array of group bitmasks, zero-padded after each plan ends
+    masks = [[sum(1 << i for i in group) for group, _, _ in steps] for steps in plans]
+    if length is None:
+        length = max((len(m) for m in masks), default=0)
+    if np is None or any(mask >> MAX_PEOPLE for m in masks for mask in m):
+        return [m + [0] * (length - len(m)) for m in masks]
+    encoded = np.zeros((len(masks), length), dtype=np.uint64)
+    for row, m in zip(encoded, masks):
+        row[:len(m)] = np.array(m, dtype=np.uint64)
+    return encoded
+
+def check_plan(times, max_group, masks):
+    # (total time, index of the first invalid step or -1) for one plan given
+    # as group bitmasks. Steps alternate forward and back starting forward;
+    # a step is invalid if it is too large or moves someone not on the torch
+    # side. The first zero mask ends the plan: if people are still waiting it
+    # is the invalid step, and so is any non-zero mask after it. The total
+    # covers the steps before the first invalid one.
+    n = len(times)
+    everyone = (1 << n) - 1
+    near = everyone
+    total = 0
+    ended = None
+    for k, mask in enumerate(masks):
+        mask = int(mask)
+        if ended is not None:
+            if mask:
+                return total, k
+            continue
+        if not mask:
+            if near:
+                return total, k
+            ended = k
+            continue
+        here = near if k % 2 == 0 else everyone ^ near
+        if mask & ~here or bin(mask).count("1") > max_group:
+            return total, k
+        near ^= mask
+        total += max(times[i] for i in range(n) if (mask >> i) & 1)
+    if near:
+        return total, len(masks)
+    return total, -1
+
+def evaluate_plans(times, max_group, plans):
+    # check and cost a whole batch of plans at once, as check_plan does for
+    # one. plans is a (plans, steps) array of group bitmasks, as built by
+    # encode_plans; returns (costs, first_violation) arrays. Each step is a
+    # few array operations over a block of plans, so per plan it costs about
+    # as much as a handful of integer ops.
+    if np is None or len(times) > MAX_PEOPLE:
+        results = [check_plan(times, max_group, masks) for masks in plans]
+        return [c for c, _ in results], [v for _, v in results]
+    plans = np.asarray(plans, dtype=np.uint64)
+    if plans.ndim != 2:
+        raise ValueError("plans must be a 2-D array of group bitmasks")
+    tables = _chunk_tables(times)
+    costs = np.zeros(len(plans), dtype=tables[0][0].dtype)
+    violation = np.empty(len(plans), dtype=np.int64)
+    for start in range(0, len(plans), BLOCK):
+        block = slice(start, start + BLOCK)
+        costs[block], violation[block] = _evaluate_block(len(times), max_group, plans[block], tables)
+    return costs, violation
+
+def _evaluate_block(n, max_group, plans, tables):
+    slowest, sizes = tables
+    count, length = plans.shape
+    # one contiguous row per step, so each step reads one run of memory
+    steps = np.ascontiguousarray(plans.T)
+    everyone = np.uint64((1 << n) - 1)
+    low = np.uint64((1 << CHUNK_BITS) - 1)
+    near = np.full(count, everyone, dtype=np.uint64)
+    costs = np.zeros(count, dtype=slowest[0].dtype)
+    violation = np.full(count, -1, dtype=np.int64)
+    ended = np.full(count, -1, dtype=np.int64)
+    live = np.ones(count, dtype=bool)
+    for k in range(length):
+        if not live.any():
+            break
+        mask = steps[k]
+        empty = mask == 0
+        ended[live & empty] = k
+        live &= ~empty
+        here = near if k % 2 == 0 else near ^ everyone
+        part = (mask & low).astype(np.intp)
+        size = sizes[0][part].astype(np.int64)
+        step = slowest[0][part]
+        for b in range(1, len(sizes)):
+            part = ((mask >> np.uint64(CHUNK_BITS * b)) & low).astype(np.intp)
+            size += sizes[b][part]
+            np.maximum(step, slowest[b][part], out=step)
+        bad = live & (((mask & ~here) != 0) | (size > max_group))
+        violation[bad] = k
+        live &= ~bad
+        near ^= mask * live
+        costs += step * live
+    # plans that stopped short, then non-zero masks after a plan's padding
+    stopped = (violation < 0) & (near != 0)
+    violation[stopped] = np.where(ended[stopped] >= 0, ended[stopped], length)
+    padded = np.flatnonzero((violation < 0) & (ended >= 0))
+    if len(padded):
+        after = (plans[padded] != 0) & (np.arange(length) > ended[padded, None])
+        late = after.any(axis=1)
+        violation[padded[late]] = after[late].argmax(axis=1)
+    return costs, violation
+
+def _chunk_tables(times):
+    # per CHUNK_BITS-bit slice of a mask: the slowest time and the number of
+    # people set, for every value of that slice
+    n = len(times)
+    dtype = np.int64 if all(isinstance(t, int) for t in times) else np.float64
+    values = np.arange(1 << CHUNK_BITS)
+    slowest = []
+    sizes = []
+    for b in range(0, max(n, 1), CHUNK_BITS):
+        table = np.zeros(1 << CHUNK_BITS, dtype=dtype)
+        size = np.zeros(1 << CHUNK_BITS, dtype=np.int8)
+        for i, t in enumerate(times[b:b + CHUNK_BITS]):
+            bit = (values >> i) & 1
+            np.maximum(table, bit * t, out=table)
+            size += bit.astype(np.int8)
+        slowest.append(table)
+        sizes.append(size)
+    return slowest, sizes
@@ -1,112 +1,186 @@
+import time
 import tkinter as tk
+from timeline import (BRIDGE_Y, BASE_GAP, LABEL_MIN_GAP, BRIDGE_LEFT, BRIDGE_RIGHT, BRIDGE_HALF_HEIGHT,
+                      BRIDGE_LABEL, PERSON_RADIUS, TORCH_HALF, TORCH_START, Timeline, grid_layout)
+
+# target frame interval of the animation clock, in milliseconds
+FRAME_MS = 16
 
 class BridgeGraphics:
     def __init__(self, parent, width=900, height=360):
         self.canvas = tk.Canvas(parent, width=width, height=height, bg="#f5f5f5")
-        self.canvas.grid(row=1, column=0, padx=10, pady=10, sticky="nsew")
+        self.canvas.grid(row=1, column=0, padx=(10,0), pady=(10,0), sticky="nsew")
+        yscroll = tk.Scrollbar(parent, orient="vertical", command=self.canvas.yview)
+        yscroll.grid(row=1, column=1, pady=(10,0), sticky="ns")
+        xscroll = tk.Scrollbar(parent, orient="horizontal", command=self.canvas.xview)
+        xscroll.grid(row=2, column=0, padx=(10,0), pady=(0,10), sticky="ew")
+        self.canvas.config(yscrollcommand=yscroll.set, xscrollcommand=xscroll.set)
+        self.canvas.bind("<MouseWheel>", self.on_wheel)
+        self.canvas.bind("<Button-4>", self.on_wheel)
+        self.canvas.bind("<Button-5>", self.on_wheel)
+        self.canvas.bind("<Control-MouseWheel>", self.on_zoom)
+        self.canvas.bind("<Control-Button-4>", self.on_zoom)
+        self.canvas.bind("<Control-Button-5>", self.on_zoom)
+        self.width = width
+        self.height = height
         self.people_items = {}
+        # canvas items are kept across solves and only hidden when unused
+        self.pool = []
         self.torch_item = None
         self.animation_in_progress = False
+        self.after_id = None
+        self.zoom = 1.0
+        self.gap = BASE_GAP
+        self.labels_shown = True
+        self.n = 0
+        self.canvas.create_rectangle(BRIDGE_LEFT, BRIDGE_Y-BRIDGE_HALF_HEIGHT, BRIDGE_RIGHT, BRIDGE_Y+BRIDGE_HALF_HEIGHT,
+                                     fill="#d2b48c", outline="#7a5230")
+        self.canvas.create_text(*BRIDGE_LABEL, text="BRIDGE", font=("Segoe UI", 10, "bold"))
+
+    def layout(self, n):
+        # past MIN_GAP the grid grows downwards and the canvas scrolls
+        return grid_layout(n, self.height)
 
     def prepare_canvas(self, times):
-        self.canvas.delete("all")
+        if self.after_id is not None:
+            self.canvas.after_cancel(self.after_id)
+            self.after_id = None
+            self.animation_in_progress = False
+        if self.zoom != 1.0:
+            self.canvas.scale("all", 0, 0, 1 / self.zoom, 1 / self.zoom)
+            self.zoom = 1.0
+        self.canvas.dtag("moving", "moving")
         n = len(times)
-        left_x = 120
-        right_x = 780
-        y_gap = 40
-        bridge_y = 180
-        y_start = bridge_y - (n - 1) * y_gap / 2 if n > 0 else bridge_y
-        radius = 18
-        self.canvas.create_rectangle(300, bridge_y-36, 600, bridge_y+36, fill="#d2b48c", outline="#7a5230")
-        self.canvas.create_text(450, bridge_y-60, text="BRIDGE", font=("Segoe UI", 10, "bold"))
+        gap, homes = self.layout(n)
+        scale = gap / BASE_GAP
+        radius = PERSON_RADIUS * scale
+        label_dy = 22 * scale
+        name_font = ("Segoe UI", max(6, round(10 * scale)), "bold")
+        time_font = ("Segoe UI", max(6, round(9 * scale)))
+        self.gap = gap
+        self.labels_shown = gap >= LABEL_MIN_GAP
+        label_state = "normal" if self.labels_shown else "hidden"
+        while len(self.pool) < n:
+            i = len(self.pool)
+            tags = ("person", f"person{i}")
+            pid = self.canvas.create_oval(0, 0, 0, 0, fill="#87ceeb", outline="#333", tags=tags)
+            txt = self.canvas.create_text(0, 0, tags=tags + ("label",))
+            tlabel = self.canvas.create_text(0, 0, tags=tags + ("label",))
+            self.pool.append((pid, txt, tlabel))
+        self.people_items = {}
         self.positions = {}
-        self.side = {i: 0 for i in range(n)}
-        for i in range(n):
-            y = y_start + i * y_gap
-            x = left_x
-            pid = self.canvas.create_oval(x-radius, y-radius, x+radius, y+radius, fill="#87ceeb", outline="#333")
-            txt = self.canvas.create_text(x, y, text=f"P{i+1}", font=("Segoe UI", 10, "bold"))
-            tlabel = self.canvas.create_text(x, y+22, text=str(times[i]), font=("Segoe UI", 9))
+        self.person_x = {}
+        for i, (x, y) in enumerate(homes):
+            pid, txt, tlabel = self.pool[i]
+            self.canvas.coords(pid, x-radius, y-radius, x+radius, y+radius)
+            self.canvas.itemconfig(pid, state="normal")
+            self.canvas.coords(txt, x, y)
+            self.canvas.itemconfig(txt, text=f"P{i+1}", font=name_font, state=label_state)
+            self.canvas.coords(tlabel, x, y+label_dy)
+            self.canvas.itemconfig(tlabel, text=str(times[i]), font=time_font, state=label_state)
             self.people_items[i] = (pid, txt, tlabel)
             self.positions[i] = (x, y)
-        torch_x = left_x + 40
-        torch_y = bridge_y - 10
-        self.torch_item = self.canvas.create_rectangle(torch_x-10, torch_y-10, torch_x+10, torch_y+10, fill="#ff8c00", outline="#333")
+            self.person_x[i] = x
+        for i in range(n, self.n):
+            for item in self.pool[i]:
+                self.canvas.itemconfig(item, state="hidden")
+        self.n = n
+        torch_x, torch_y = TORCH_START
+        if self.torch_item is None:
+            self.torch_item = self.canvas.create_rectangle(0, 0, 0, 0, fill="#ff8c00", outline="#333")
+        self.canvas.coords(self.torch_item, torch_x-TORCH_HALF, torch_y-TORCH_HALF, torch_x+TORCH_HALF, torch_y+TORCH_HALF)
+        self.canvas.tag_raise(self.torch_item)
         self.torch_pos = (torch_x, torch_y)
-        self.left_x = left_x
-        self.right_x = right_x
-        self.bridge_y = bridge_y
-        for i in range(n):
-            self.update_person_pos(i, left=True, instant=True)
+        self.update_scrollregion()
+
+    def update_scrollregion(self):
+        bottom = max(self.height, max((y for _, y in self.positions.values()), default=0) + self.gap)
+        z = self.zoom
+        self.canvas.config(scrollregion=(0, 0, max(self.width, self.width * z), max(self.height, bottom * z)))
+
+    def on_wheel(self, event):
+        step = -1 if getattr(event, "num", None) == 4 or getattr(event, "delta", 0) > 0 else 1
+        self.canvas.yview_scroll(step, "units")
 
-    def update_person_pos(self, idx, left=True, instant=False):
-        if left:
-            tx = self.left_x
-        else:
-            tx = self.right_x
-        ty = self.positions[idx][1]
-        pid, txt, tlabel = self.people_items[idx]
-        if instant:
-            self.canvas.coords(pid, tx-18, ty-18, tx+18, ty+18)
-            self.canvas.coords(txt, tx, ty)
-            self.canvas.coords(tlabel, tx, ty+22)
-        else:
-            self.canvas.coords(pid, tx-18, ty-18, tx+18, ty+18)
-            self.canvas.coords(txt, tx, ty)
-            self.canvas.coords(tlabel, tx, ty+22)
+    def on_zoom(self, event):
+        zoom_in = getattr(event, "num", None) == 4 or getattr(event, "delta", 0) > 0
+        factor = 1.25 if zoom_in else 0.8
+        new_zoom = min(4.0, max(0.25, self.zoom * factor))
+        if new_zoom == self.zoom:
+            return
+        # scale about the origin so canvas coordinates stay model * zoom
+        self.canvas.scale("all", 0, 0, new_zoom / self.zoom, new_zoom / self.zoom)
+        self.zoom = new_zoom
+        self.update_scrollregion()
+        shown = self.gap * self.zoom >= LABEL_MIN_GAP
+        if shown != self.labels_shown:
+            self.labels_shown = shown
+            state = "normal" if shown else "hidden"
+            for i in range(self.n):
+                _, txt, tlabel = self.pool[i]
+                self.canvas.itemconfig(txt, state=state)
+                self.canvas.itemconfig(tlabel, state=state)
+
+    def move_torch(self, x, y):
+        tx, ty = self.torch_pos
+        if x != tx or y != ty:
+            self.canvas.move(self.torch_item, (x - tx) * self.zoom, (y - ty) * self.zoom)
+            self.torch_pos = (x, y)
 
     def animate_steps(self, steps, times):
+        # one frame clock drives the whole plan: each tick works out where
+        # everyone should be from the elapsed time, so late ticks skip frames
+        # instead of stretching playback
         self.animation_in_progress = True
-        seq = list(steps)
-        def run_step(i):
-            if i >= len(seq):
-                self.animation_in_progress = False
-                return
-            group, direction, t = seq[i]
-            duration = max(1000, min(9000, t * 700))
-            frames = max(10, int(duration / 30))
-            if direction == "->":
-                start_positions = {g: (self.left_x, self.positions[g][1]) for g in group}
-                end_x = self.right_x
-            else:
-                start_positions = {g: (self.right_x, self.positions[g][1]) for g in group}
-                end_x = self.left_x
-            group_ys = [self.positions[g][1] for g in group]
-            torch_y = sum(group_ys) / len(group_ys) if group_ys else self.bridge_y - 10
-            torch_start = (self.torch_pos[0], self.torch_pos[1])
-            if direction == "->":
-                torch_end = (end_x - 40, torch_y)
-            else:
-                torch_end = (end_x + 40, torch_y)
-            deltas = {g: (end_x - start_positions[g][0]) for g in group}
-            torch_dx = (torch_end[0] - torch_start[0])
-            frame = 0
-            def animate_frame():
-                nonlocal frame
-                if frame >= frames:
-                    for g in group:
-                        self.side[g] = 0 if direction == "<-" else 1
-                        self.update_person_pos(g, left=(self.side[g] == 0), instant=True)
-                    self.torch_pos = (torch_end[0], torch_end[1])
-                    self.canvas.coords(self.torch_item, torch_end[0]-10, torch_end[1]-10, torch_end[0]+10, torch_end[1]+10)
-                    self.canvas.update()
-                    self.canvas.after(400, lambda: run_step(i + 1))
-                    return
-                p = frame / frames
-                for g in group:
-                    sx, sy = start_positions[g]
-                    dx = deltas[g]
-                    nx = sx + dx * p
-                    ny = sy
-                    pid, txt, tlabel = self.people_items[g]
-                    self.canvas.coords(pid, nx - 18, ny - 18, nx + 18, ny + 18)
-                    self.canvas.coords(txt, nx, ny)
-                    self.canvas.coords(tlabel, nx, ny + 22)
-                tnx = torch_start[0] + torch_dx * p
-                tny = torch_y
-                self.torch_pos = (tnx, tny)
-                self.canvas.coords(self.torch_item, tnx-10, tny-10, tnx+10, tny+10)
-                frame += 1
-                self.canvas.after(30, animate_frame)
-            animate_frame()
-        run_step(0)
+        homes = [self.positions[i] for i in range(self.n)]
+        self.schedule = Timeline(steps, homes).segments
+        self.step_index = 0
+        self.step_motion = None
+        self.clock_start = time.monotonic()
+        self.next_frame = 0
+        self.tick()
+
+    def tick(self):
+        now = (time.monotonic() - self.clock_start) * 1000
+        while self.step_index < len(self.schedule):
+            seg = self.schedule[self.step_index]
+            if now < seg.start:
+                break
+            if self.step_motion is None:
+                self.step_motion = self.begin_step(seg)
+            if now >= seg.end:
+                self.finish_step(seg)
+                self.step_index += 1
+                self.step_motion = None
+                continue
+            p = (now - seg.start) / (seg.end - seg.start)
+            self.shift_movers(seg.distance * p)
+            self.move_torch(seg.torch_from[0] + (seg.torch_to[0] - seg.torch_from[0]) * p, seg.torch_to[1])
+            break
+        if self.step_index >= len(self.schedule):
+            self.animation_in_progress = False
+            self.after_id = None
+            return
+        self.next_frame = max(self.next_frame + FRAME_MS, now)
+        self.after_id = self.canvas.after(max(1, int(self.next_frame - now)), self.tick)
+
+    def begin_step(self, seg):
+        # everyone crossing shares the "moving" tag and the same offset, so a
+        # frame is one canvas.move however many people are on the bridge
+        for g in seg.group:
+            self.canvas.addtag_withtag("moving", f"person{g}")
+        self.offset = 0
+        return seg
+
+    def shift_movers(self, offset):
+        dx = offset - self.offset
+        if dx:
+            self.canvas.move("moving", dx * self.zoom, 0)
+            self.offset = offset
+
+    def finish_step(self, seg):
+        self.shift_movers(seg.distance)
+        self.canvas.dtag("moving", "moving")
+        for g in seg.group:
+            self.person_x[g] += seg.distance
+        self.move_torch(*seg.torch_to)
@@ -0,0 +1,423 @@
+import bisect
+import heapq
+from solver import greedy_crossing_with_path
+
+# sorted times are kept in blocks of about this many for the capacity-2 solver
+BLOCK_SIZE = 256
+INF = float('inf')
+
+class IncrementalSolver:
+    # keeps the solver's work between what-if edits of one instance, so that
+    # changing one person's time, adding or removing a person only redoes the
+    # part that depends on them. solve() returns the same total as
+    # min_crossing_with_path on the current times, with an optimal plan.
+    #
+    # Both exact solvers only look at the sorted times. For capacity 2 the
+    # greedy total is a sum over alternating ranks, kept per block of sorted
+    # times so an edit touches one block and adds up the rest. For other
+    # capacities the DP's cost to finish is tabled per run of people still
+    # waiting, which only depends on the times ranked up to the slowest of
+    # them, so an edit recomputes the table from the lowest rank it changed
+    # upwards: editing the slowest people is cheap, while an edit among the
+    # max_group fastest changes the shuttle times every entry includes and
+    # costs as much as building the tables again (still less than solving
+    # from scratch, about 1 s against 3 s at n=150, max_group=3).
+    def __init__(self, times, max_group):
+        self.times = list(times)
+        self.max_group = max_group
+        self.steps = None
+        if max_group == 2:
+            self.engine = _PairSums(sorted(self.times))
+        else:
+            self.engine = _LevelTables(sorted(self.times), max_group)
+
+    def set_time(self, i, value):
+        old = self.times[i]
+        if old == value:
+            return
+        self.engine.remove(self._rank(i))
+        self.times[i] = value
+        self.engine.insert(self._rank(i), value)
+        self.steps = None
+
+    def insert(self, value, i=None):
+        i = len(self.times) if i is None else i
+        self.times.insert(i, value)
+        self.engine.insert(self._rank(i), value)
+        self.steps = None
+
+    def remove(self, i):
+        self.engine.remove(self._rank(i))
+        del self.times[i]
+        self.steps = None
+
+    def update(self, times):
+        # move to new times, as a single edit when they are one; anything
+        # else starts over
+        times = list(times)
+        edit = single_edit(self.times, times)
+        if edit is None:
+            self.__init__(times, self.max_group)
+        elif edit[0] == "set":
+            self.set_time(edit[1], times[edit[1]])
+        elif edit[0] == "insert":
+            self.insert(times[edit[1]], edit[1])
+        elif edit[0] == "remove":
+            self.remove(edit[1])
+        return self
+
+    def total(self):
+        return self.engine.total()
+
+    def solve(self):
+        # the plan itself lists every crossing, so it is rebuilt on demand
+        # from the kept state rather than on every edit
+        if self.steps is None:
+            if self.max_group == 2:
+                self.steps = greedy_crossing_with_path(self.times)[1]
+            else:
+                order = sorted(range(len(self.times)), key=lambda i: self.times[i])
+                self.steps = self.engine.steps(order)
+        return self.total(), self.steps
+
+    def _rank(self, i):
+        # where person i sits in the solvers' stable sort by time
+        value = self.times[i]
+        return self.engine.bisect(value) + self.times[:i].count(value)
+
+def single_edit(old, new):
+    # ("set" | "insert" | "remove", index) if new is old with one change,
+    # ("same", None) if they are equal, else None
+    if len(old) == len(new):
+        diff = [i for i in range(len(old)) if old[i] != new[i]]
+        if not diff:
+            return ("same", None)
+        return ("set", diff[0]) if len(diff) == 1 else None
+    if abs(len(old) - len(new)) != 1:
+        return None
+    short, long_ = (old, new) if len(old) < len(new) else (new, old)
+    i = 0
+    while i < len(short) and short[i] == long_[i]:
+        i += 1
+    if short[i:] != long_[i + 1:]:
+        return None
+    return ("insert", i) if len(new) > len(old) else ("remove", i)
+
+class _PairSums:
+    # greedy total for capacity 2 from the sorted times t: with a, b the two
+    # fastest, the slowest remaining pair (y, z) costs z + min(a + 2b, 2a + y),
+    # so it is the sum of every other rank from the top, plus
+    # 2a + min(y, 2b - a) for each y of the other ranks, plus a short tail
+    def __init__(self, t):
+        self.blocks = [t[i:i + BLOCK_SIZE] for i in range(0, len(t), BLOCK_SIZE)]
+        self.n = len(t)
+        self.threshold = self._threshold()
+        self.sums = [self._block_sums(block) for block in self.blocks]
+
+    def _threshold(self):
+        if self.n < 2:
+            return INF
+        a, b = self._fastest()
+        return 2 * b - a
+
+    def _fastest(self):
+        first = self.blocks[0]
+        a = first[0]
+        b = first[1] if len(first) > 1 else self.blocks[1][0]
+        return a, b
+
+    def _block_sums(self, block):
+        # sums of the times and of min(time, threshold) at even and odd
+        # positions within the block
+        T = self.threshold
+        even = block[::2]
+        odd = block[1::2]
+        return (sum(even), sum(odd),
+                sum(x if x < T else T for x in even), sum(x if x < T else T for x in odd))
+
+    def _locate(self, rank):
+        for b, block in enumerate(self.blocks):
+            if rank <= len(block):
+                return b, rank
+            rank -= len(block)
+        return len(self.blocks) - 1, len(self.blocks[-1])
+
+    def bisect(self, value):
+        rank = 0
+        for block in self.blocks:
+            if block[-1] < value:
+                rank += len(block)
+            else:
+                return rank + bisect.bisect_left(block, value)
+        return rank
+
+    def insert(self, rank, value):
+        self.n += 1
+        if not self.blocks:
+            self.blocks.append([value])
+            self.sums.append(None)
+            b = 0
+        else:
+            b, pos = self._locate(rank)
+            self.blocks[b].insert(pos, value)
+            if len(self.blocks[b]) > 2 * BLOCK_SIZE:
+                block = self.blocks[b]
+                self.blocks[b:b + 1] = [block[:BLOCK_SIZE], block[BLOCK_SIZE:]]
+                self.sums[b:b + 1] = [None, None]
+                self.sums[b + 1] = self._block_sums(self.blocks[b + 1])
+        self._refresh(b)
+
+    def remove(self, rank):
+        self.n -= 1
+        b, pos = self._locate(rank + 1)
+        del self.blocks[b][pos - 1]
+        if not self.blocks[b]:
+            del self.blocks[b]
+            del self.sums[b]
+            b = 0
+        self._refresh(b)
+
+    def _refresh(self, b):
+        threshold = self._threshold()
+        if threshold != self.threshold:
+            # the two fastest changed: every min(y, 2b - a) needs redoing
+            self.threshold = threshold
+            self.sums = [self._block_sums(block) for block in self.blocks]
+        elif self.blocks:
+            self.sums[b] = self._block_sums(self.blocks[b])
+
+    def total(self):
+        n = self.n
+        if n == 0:
+            return None
+        if n == 1:
+            return self.blocks[0][0]
+        a, b = self._fastest()
+        # sums over all ranks by parity, then leave out ranks 0 and 1
+        t = [0, 0]
+        m = [0, 0]
+        offset = 0
+        for block, (t_even, t_odd, m_even, m_odd) in zip(self.blocks, self.sums):
+            if offset % 2:
+                t_even, t_odd, m_even, m_odd = t_odd, t_even, m_odd, m_even
+            t[0] += t_even
+            t[1] += t_odd
+            m[0] += m_even
+            m[1] += m_odd
+            offset += len(block)
+        T = self.threshold
+        t[0] -= a
+        t[1] -= b
+        m[0] -= a if a < T else T
+        m[1] -= b if b < T else T
+        # the top-ranked of each pair is paid in full, the other through
+        # min(y, 2b - a); an odd count leaves rank 2 for the tail
+        total = t[(n - 1) % 2] + m[n % 2] + (n - 2) // 2 * 2 * a
+        return total + (a + b if n % 2 else b)
+
+class _LevelTables:
+    # for each shuttle count k, the DP's cost to finish from every state,
+    # level by level in the rank k + j just above the slowest one-way person
+    # still waiting; see solver.dp_plans for the model. Level j only depends
+    # on t[:k + j], so edits just note the lowest rank they touched and the
+    # levels above it are recomputed when the total is next asked for; below
+    # rank k that is every level.
+    def __init__(self, t, max_group):
+        self.t = t
+        self.max_group = max_group
+        self.tables = {}
+        self.dirty = 0
+
+    def bisect(self, value):
+        return bisect.bisect_left(self.t, value)
+
+    def insert(self, rank, value):
+        self.t.insert(rank, value)
+        self.dirty = rank if self.dirty is None else min(self.dirty, rank)
+
+    def remove(self, rank):
+        del self.t[rank]
+        self.dirty = rank if self.dirty is None else min(self.dirty, rank)
+
+    def _refresh(self):
+        # recompute every level that depends on sorted positions >= dirty
+        if self.dirty is None:
+            return
+        rank = self.dirty
+        self.dirty = None
+        n = len(self.t)
+        for k in list(self.tables):
+            if k > min(n - 1, self.max_group):
+                del self.tables[k]
+        for k in range(1, min(n - 1, self.max_group) + 1):
+            table = self.tables.get(k)
+            if table is None:
+                table = self.tables[k] = _ShuttleTable(self.t, k, self.max_group)
+            elif rank < k:
+                table.set_shuttles(self.t)
+            table.extend(self.t, max(1, rank - k + 1))
+
+    def total(self):
+        self._refresh()
+        n = len(self.t)
+        if n == 0:
+            return None
+        if n <= self.max_group:
+            return self.t[-1]
+        best = None
+        for k in range(1, min(n - 1, self.max_group) + 1):
+            cost = self.tables[k].start_cost(n)
+            if cost < INF and (best is None or cost < best):
+                best = cost
+        return best
+
+    def steps(self, order):
+        self._refresh()
+        n = len(self.t)
+        if n == 0:
+            return []
+        if n <= self.max_group:
+            return [(list(range(n)), "->", self.t[-1])]
+        best = None
+        for k in range(1, min(n - 1, self.max_group) + 1):
+            cost = self.tables[k].start_cost(n)
+            if cost < INF and (best is None or cost < best[0]):
+                best = (cost, k)
+        if best is None:
+            return []
+        steps = []
+        for group, direction in self.tables[best[1]].path(n):
+            steps.append((sorted(order[p] for p in group), direction, max(self.t[p] for p in group)))
+        return steps
+
+class _ShuttleTable:
+    # costs to finish for the k fastest as shuttles. Level j holds one table
+    # per run k + i .. k + j - 1 of one-way people still waiting, i <= j;
+    # states within a table are numbered near * 2 + side, the shuttles on
+    # the start side being the fastest near of them. Moves within a table
+    # (shuttle-only trips and returns) only cost shuttle times, so they are
+    # set up once per set of shuttle times. Trips taking slow people lead to
+    # a lower level, trips taking only fast ones to a later table of the
+    # same level, which is why each level is filled from its last table
+    # down. With nobody waiting the table is the same for every level.
+    def __init__(self, t, k, max_group):
+        self.k = k
+        self.max_group = max_group
+        self.levels = []
+        self.choices = []
+        self.set_shuttles(t)
+
+    def set_shuttles(self, t):
+        # moves among the shuttles for shuttle times t[:k]; every level's
+        # costs include them, so all levels are dropped
+        k = self.k
+        self.loads = []
+        self.preds = [[] for _ in range(2 * (k + 1))]
+        for near in range(k + 1):
+            # a trip takes the slowest r of the shuttles on the start side
+            loads = [(0, near, 0)]
+            for r in range(1, min(near, self.max_group) + 1):
+                loads.append((r, near - r, t[near - 1]))
+                self.preds[(near - r) * 2 + 1].append((near * 2, t[near - 1], r))
+            self.loads.append(loads)
+            if near < k:
+                # and the fastest one on the far side brings the torch back
+                self.preds[(near + 1) * 2].append((near * 2 + 1, t[near], near))
+        self.empty = self._settle(None)
+        del self.levels[:]
+        del self.choices[:]
+
+    def extend(self, t, first):
+        # drop levels from first upwards and compute them again for t
+        del self.levels[first:]
+        del self.choices[first:]
+        k = self.k
+        c = self.max_group
+        if not self.levels:
+            self.levels.append([self.empty[0]])
+            self.choices.append([self.empty[1]])
+        for j in range(len(self.levels), len(t) - k + 1):
+            slowest = t[k + j - 1]
+            costs = [None] * (j + 1)
+            choices = [None] * (j + 1)
+            costs[j], choices[j] = self.empty
+            for i in range(j - 1, -1, -1):
+                waiting = j - i
+                exits = []
+                for near, loads in enumerate(self.loads):
+                    best = INF
+                    choice = None
+                    for r, new_near, paid in loads:
+                        seats = c - r if c - r < waiting else waiting
+                        state = new_near * 2 + 1
+                        for slow in range(seats + 1):
+                            for fast in range(0 if slow or r else 1, seats - slow + 1):
+                                if slow:
+                                    trip = slowest if slowest > paid else paid
+                                    cost = trip + self.levels[j - slow][i + fast][state]
+                                elif fast:
+                                    trip = t[k + i + fast - 1]
+                                    trip = trip if trip > paid else paid
+                                    cost = trip + costs[i + fast][state]
+                                else:
+                                    continue
+                                if cost < best:
+                                    best = cost
+                                    choice = ("->", r, slow, fast, new_near)
+                    exits.append((near * 2, best, choice))
+                costs[i], choices[i] = self._settle(exits)
+            self.levels.append(costs)
+            self.choices.append(choices)
+
+    def _settle(self, exits):
+        # settle one table: Dijkstra backwards over the moves within it,
+        # seeded with the cost of leaving it
+        size = len(self.loads)
+        cost = [INF] * (2 * size)
+        choice = [None] * (2 * size)
+        if exits is None:
+            cost[1] = 0
+        else:
+            for state, c, how in exits:
+                cost[state] = c
+                choice[state] = how
+        pq = [(c, state) for state, c in enumerate(cost) if c < INF]
+        heapq.heapify(pq)
+        while pq:
+            c, state = heapq.heappop(pq)
+            if c > cost[state]:
+                continue
+            for pred, step, move in self.preds[state]:
+                if c + step < cost[pred]:
+                    cost[pred] = c + step
+                    choice[pred] = ("=", move, state)
+                    heapq.heappush(pq, (c + step, pred))
+        return cost, choice
+
+    def start_cost(self, n):
+        return self.levels[n - self.k][0][self.k * 2]
+
+    def path(self, n):
+        # follow the recorded choices from the start to the target
+        k = self.k
+        j = n - k
+        i = 0
+        state = k * 2
+        path = []
+        while (i, state) != (j, 1):
+            near, side = divmod(state, 2)
+            how = self.choices[j][i][state]
+            shuttles = list(range(near - how[1], near)) if side == 0 else []
+            if how[0] == "->":
+                _, r, slow, fast, new_near = how
+                path.append((shuttles + list(range(k + i, k + i + fast)) + list(range(k + j - slow, k + j)), "->"))
+                j -= slow
+                i += fast
+                state = new_near * 2 + 1
+            elif side == 0:
+                state = how[2]
+                path.append((shuttles, "->"))
+            else:
+                p, state = how[1], how[2]
+                path.append(([p], "<-"))
+        return path
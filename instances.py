@@ -0,0 +1,33 @@
+import math
+
+# parsing and checking of (times, max_group) instances, shared by the CLI,
+# the batch readers and the solve service
+
+def parse_record(record):
+    # a decoded JSON instance: {"times": [...], "max_group": n} or [times, n]
+    if isinstance(record, dict):
+        return validate(record["times"], record["max_group"])
+    return validate(record[0], record[1])
+
+def validate(times, max_group):
+    if not isinstance(times, (list, tuple)):
+        raise ValueError("times must be a list")
+    times = [number(t) for t in times]
+    if not times:
+        raise ValueError("no times")
+    if not all(math.isfinite(t) for t in times):
+        raise ValueError("time is not a finite number")
+    if any(t < 0 for t in times):
+        raise ValueError("negative time")
+    if not isinstance(max_group, int) or isinstance(max_group, bool) or max_group < 1:
+        raise ValueError("max_group must be a positive integer")
+    return times, max_group
+
+def number(x):
+    if isinstance(x, (int, float)) and not isinstance(x, bool):
+        return x
+    x = str(x).strip()
+    try:
+        return int(x)
+    except ValueError:
+        return float(x)
@@ -0,0 +1,26 @@
+class SolveStats(dict):
+    # per-solve counters, filled in by any solver that takes a stats mapping.
+    # A plain dict gets the counters only; this adds opt-in phase timings and
+    # a progress hook called as progress(expanded, bound) every `every`
+    # expansions, where bound is the cost at the head of the queue.
+    def __init__(self, timing=False, progress=None, every=1024):
+        super().__init__()
+        self.timing = timing
+        self.progress = progress
+        self.every = every
+
+COUNTERS = (
+    ("expanded", "expanded"),
+    ("pushed", "pushed"),
+    ("stale", "stale pops"),
+    ("generated", "moves generated"),
+)
+
+def format_stats(stats):
+    if stats.get("cache_hit"):
+        return "Served from cache"
+    parts = [f"{stats[key]} {label}" for key, label in COUNTERS if key in stats]
+    timings = [(key[5:], value) for key, value in stats.items() if key.startswith("time_")]
+    if timings:
+        parts.append(", ".join(f"{name} {value * 1000:.1f} ms" for name, value in timings))
+    return "Search: " + ", ".join(parts) if parts else ""
@@ -0,0 +1,359 @@
+import argparse
+import functools
+import os
+import struct
+import sys
+import zlib
+from batch import map_batch
+from cli import read_csv, read_jsonl, write
+from solver import min_crossing_with_path
+from timeline import (BASE_GAP, BRIDGE_Y, LABEL_MIN_GAP, BRIDGE_LEFT, BRIDGE_RIGHT, BRIDGE_HALF_HEIGHT,
+                      BRIDGE_LABEL, PERSON_RADIUS, TORCH_HALF, Timeline, grid_layout)
+
+try:
+    from PIL import Image, ImageDraw, ImageFont
+except ImportError:
+    Image = None
+
+WIDTH = 900
+HEIGHT = 360
+# the GUI's colours; frames are palette images so both backends and both
+# file formats share these indices
+PALETTE = [
+    (245, 245, 245),
+    (210, 180, 140),
+    (122, 82, 48),
+    (135, 206, 235),
+    (51, 51, 51),
+    (255, 140, 0),
+    (0, 0, 0),
+    (255, 255, 255),
+]
+BACKGROUND, BRIDGE, BRIDGE_EDGE, PERSON, INK, TORCH = range(6)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render solved bridge and torch plans to PNG frames or GIFs without a display.")
+    parser.add_argument("input", nargs="?", default="-", help="JSONL or CSV file of instances, - for stdin")
+    parser.add_argument("-o", "--out-dir", default="frames", help="directory for the rendered plans")
+    parser.add_argument("-f", "--format", choices=["jsonl", "csv"], help="input format (default: from the file extension, else jsonl)")
+    parser.add_argument("--gif", action="store_true", help="write one animated GIF per plan instead of a directory of PNG frames")
+    parser.add_argument("--fps", type=float, default=20, help="frames per second of playback")
+    parser.add_argument("--speed", type=float, default=1.0, help="playback speed relative to the GUI")
+    parser.add_argument("--scale", type=float, default=1.0, help="image size relative to the GUI canvas")
+    parser.add_argument("--backend", choices=["pillow", "pure"], help="drawing backend (default: pillow if installed)")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="worker processes (default: 1, render in-process)")
+    parser.add_argument("--chunksize", type=int, default=1, help="plans per worker task")
+    args = parser.parse_args(argv)
+
+    fmt = args.format
+    if fmt is None:
+        fmt = "csv" if args.input.lower().endswith(".csv") else "jsonl"
+    os.makedirs(args.out_dir, exist_ok=True)
+    job = functools.partial(render_instance, fps=args.fps, speed=args.speed, scale=args.scale, backend=args.backend)
+    src = sys.stdin if args.input == "-" else open(args.input, newline="")
+    pending = {}
+
+    def items():
+        submitted = 0
+        for index, instance, error in read_csv(src) if fmt == "csv" else read_jsonl(src):
+            if error is not None:
+                write(sys.stdout, {"index": index, "error": error})
+                continue
+            path = os.path.join(args.out_dir, f"plan{index:05d}" + (".gif" if args.gif else ""))
+            pending[submitted] = (index, path)
+            submitted += 1
+            yield instance + (path,)
+
+    try:
+        for batch_index, (total, frames) in map_batch(job, items(), args.workers, args.chunksize):
+            index, path = pending.pop(batch_index)
+            write(sys.stdout, {"index": index, "total": total, "frames": frames, "path": path})
+    finally:
+        if src is not sys.stdin:
+            src.close()
+
+def render_instance(times, max_group, path, fps=20, speed=1.0, scale=1.0, backend=None):
+    # solve and render one instance; module level so worker processes can
+    # run it
+    total, steps = min_crossing_with_path(times, max_group)
+    return total, render_plan(times, steps, path, fps, speed, scale, backend)
+
+def render_plan(times, steps, path, fps=20, speed=1.0, scale=1.0, backend=None):
+    # play a plan back as the GUI would and write it to path: an animated
+    # GIF if path ends in .gif, else a directory of numbered PNG frames.
+    # Returns the number of frames.
+    backend = backend or ("pillow" if Image is not None else "pure")
+    if backend == "pillow" and Image is None:
+        raise RuntimeError("the pillow backend needs Pillow installed")
+    gap, homes = grid_layout(len(times), HEIGHT)
+    # there is no scrolling offscreen, so tall crowds get a taller image
+    height = max(HEIGHT, max((y for _, y in homes), default=0) + gap)
+    timeline = Timeline(steps, homes, speed)
+    frames = draw_frames(times, timeline, gap, height, fps, scale, PillowFrame if backend == "pillow" else PixelFrame)
+    if path.lower().endswith(".gif"):
+        if backend == "pillow":
+            return save_gif_pillow(path, frames, fps)
+        return save_gif(path, frames, fps)
+    os.makedirs(path, exist_ok=True)
+    count = 0
+    for count, frame in enumerate(frames, 1):
+        frame.save_png(os.path.join(path, f"frame{count - 1:05d}.png"))
+    return count
+
+def draw_frames(times, timeline, gap, height, fps, scale, frame_type):
+    s = scale
+    base = frame_type(round(WIDTH * s), round(height * s))
+    base.rect((BRIDGE_LEFT*s, (BRIDGE_Y-BRIDGE_HALF_HEIGHT)*s, BRIDGE_RIGHT*s, (BRIDGE_Y+BRIDGE_HALF_HEIGHT)*s), BRIDGE, BRIDGE_EDGE)
+    base.text(BRIDGE_LABEL[0]*s, BRIDGE_LABEL[1]*s, "BRIDGE", 10*s)
+    size = gap / BASE_GAP
+    radius = PERSON_RADIUS * size
+    labels = gap * s >= LABEL_MIN_GAP
+    for xs, (tx, ty) in timeline.frames(fps):
+        frame = base.copy()
+        for i, x in enumerate(xs):
+            y = timeline.homes[i][1]
+            frame.ellipse(((x-radius)*s, (y-radius)*s, (x+radius)*s, (y+radius)*s), PERSON, INK)
+            if labels:
+                frame.text(x*s, y*s, f"P{i+1}", 10*size*s)
+                frame.text(x*s, (y+22*size)*s, str(times[i]), 9*size*s)
+        frame.rect(((tx-TORCH_HALF)*s, (ty-TORCH_HALF)*s, (tx+TORCH_HALF)*s, (ty+TORCH_HALF)*s), TORCH, INK)
+        yield frame
+
+class PixelFrame:
+    # palette image drawn in pure Python for hosts without Pillow; it has no
+    # font rasteriser, so labels are left out
+    def __init__(self, width, height, pixels=None):
+        self.width = width
+        self.height = height
+        self.pixels = pixels if pixels is not None else bytearray([BACKGROUND]) * (width * height)
+
+    def copy(self):
+        return PixelFrame(self.width, self.height, bytearray(self.pixels))
+
+    def span(self, y, x0, x1, color):
+        if 0 <= y < self.height:
+            x0 = max(0, x0)
+            x1 = min(self.width - 1, x1)
+            if x0 <= x1:
+                row = y * self.width
+                self.pixels[row + x0:row + x1 + 1] = bytes([color]) * (x1 - x0 + 1)
+
+    def rect(self, box, fill, outline=None):
+        x0, y0, x1, y1 = (round(v) for v in box)
+        for y in range(y0, y1 + 1):
+            self.span(y, x0, x1, fill)
+        if outline is not None:
+            self.span(y0, x0, x1, outline)
+            self.span(y1, x0, x1, outline)
+            for y in range(y0, y1 + 1):
+                self.span(y, x0, x0, outline)
+                self.span(y, x1, x1, outline)
+
+    def ellipse(self, box, fill, outline=None):
+        if outline is not None:
+            self.disc(box, outline)
+            box = (box[0] + 1, box[1] + 1, box[2] - 1, box[3] - 1)
+        self.disc(box, fill)
+
+    def disc(self, box, color):
+        cx = (box[0] + box[2]) / 2
+        cy = (box[1] + box[3]) / 2
+        rx = (box[2] - box[0]) / 2
+        ry = (box[3] - box[1]) / 2
+        if rx <= 0 or ry <= 0:
+            return
+        for y in range(round(cy - ry), round(cy + ry) + 1):
+            d = (y - cy) / ry
+            if d * d <= 1:
+                half = rx * (1 - d * d) ** 0.5
+                self.span(y, round(cx - half), round(cx + half), color)
+
+    def text(self, x, y, text, size):
+        pass
+
+    def indices(self):
+        return self.pixels
+
+    def save_png(self, path):
+        w = self.width
+        raw = b"".join(b"\x00" + self.pixels[y*w:(y+1)*w] for y in range(self.height))
+        with open(path, "wb") as f:
+            f.write(b"\x89PNG\r\n\x1a\n")
+            f.write(_png_chunk(b"IHDR", struct.pack(">IIBBBBB", w, self.height, 8, 3, 0, 0, 0)))
+            f.write(_png_chunk(b"PLTE", bytes(c for rgb in PALETTE for c in rgb)))
+            f.write(_png_chunk(b"IDAT", zlib.compress(raw, 6)))
+            f.write(_png_chunk(b"IEND", b""))
+
+class PillowFrame:
+    def __init__(self, width, height, image=None):
+        if image is None:
+            image = Image.new("P", (width, height), BACKGROUND)
+            image.putpalette([c for rgb in PALETTE for c in rgb])
+        self.image = image
+        self.draw = ImageDraw.Draw(image)
+
+    def copy(self):
+        return PillowFrame(0, 0, self.image.copy())
+
+    def rect(self, box, fill, outline=None):
+        self.draw.rectangle(box, fill=fill, outline=outline)
+
+    def ellipse(self, box, fill, outline=None):
+        self.draw.ellipse(box, fill=fill, outline=outline)
+
+    def text(self, x, y, text, size):
+        font = _font(max(6, round(size)))
+        left, top, right, bottom = self.draw.textbbox((0, 0), text, font=font)
+        self.draw.text((x - (left + right) / 2, y - (top + bottom) / 2), text, fill=INK, font=font)
+
+    def indices(self):
+        return self.image.tobytes()
+
+    def save_png(self, path):
+        self.image.save(path)
+
+@functools.lru_cache(maxsize=None)
+def _font(size):
+    try:
+        return ImageFont.load_default(size)
+    except TypeError:
+        return ImageFont.load_default()
+
+def _png_chunk(tag, data):
+    return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xffffffff)
+
+def save_gif_pillow(path, frames, fps):
+    count = 0
+
+    def images():
+        nonlocal count
+        for frame in frames:
+            count += 1
+            yield frame.image
+
+    images = images()
+    first = next(images)
+    first.save(path, save_all=True, append_images=images, duration=round(1000 / fps), loop=0)
+    return count
+
+def save_gif(path, frames, fps):
+    # animated GIF writer for the pure backend. Each frame only stores the
+    # box that changed since the previous one, and unchanged frames just
+    # extend the previous frame's delay, so a plan's long pauses and single
+    # moving group stay cheap to encode.
+    delay = max(2, round(100 / fps))
+    count = 0
+    with open(path, "wb") as f:
+        prev = None
+        pending = None
+        for frame in frames:
+            count += 1
+            pixels = bytes(frame.indices())
+            if prev is None:
+                width, height = frame.width, frame.height
+                f.write(b"GIF89a" + struct.pack("<HHBBB", width, height, 0xF2, 0, 0))
+                f.write(bytes(c for rgb in PALETTE for c in rgb))
+                f.write(b"!\xff\x0bNETSCAPE2.0\x03\x01\x00\x00\x00")
+                box = (0, 0, width - 1, height - 1)
+            else:
+                box = _changed_box(prev, pixels, width, height)
+                if box is None:
+                    pending[1] += delay
+                    continue
+            if pending is not None:
+                _write_gif_frame(f, *pending)
+            left, top, right, bottom = box
+            data = b"".join(pixels[y*width + left:y*width + right + 1] for y in range(top, bottom + 1))
+            pending = [box, delay, data]
+            prev = pixels
+        if pending is not None:
+            _write_gif_frame(f, *pending)
+        f.write(b";")
+    return count
+
+def _write_gif_frame(f, box, delay, data):
+    left, top, right, bottom = box
+    # disposal 1: leave the frame in place so the next box draws over it
+    f.write(b"!\xf9\x04\x04" + struct.pack("<H", min(delay, 0xffff)) + b"\x00\x00")
+    f.write(b"," + struct.pack("<HHHHB", left, top, right - left + 1, bottom - top + 1, 0))
+    f.write(b"\x03")
+    encoded = _lzw(data, 3)
+    for i in range(0, len(encoded), 255):
+        block = encoded[i:i + 255]
+        f.write(bytes([len(block)]) + block)
+    f.write(b"\x00")
+
+def _changed_box(prev, cur, width, height):
+    # bounding box of the pixels that differ, or None if none do
+    rows = [y for y in range(height) if prev[y*width:(y+1)*width] != cur[y*width:(y+1)*width]]
+    if not rows:
+        return None
+    left, right = width - 1, 0
+    for y in rows:
+        a = prev[y*width:(y+1)*width]
+        b = cur[y*width:(y+1)*width]
+        # binary search for the first and last differing column
+        lo, hi = 0, left
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if a[:mid + 1] != b[:mid + 1]:
+                hi = mid
+            else:
+                lo = mid + 1
+        left = lo
+        lo, hi = right, width - 1
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if a[mid:] != b[mid:]:
+                lo = mid
+            else:
+                hi = mid - 1
+        right = lo
+    return left, rows[0], right, rows[-1]
+
+def _lzw(data, min_size):
+    clear = 1 << min_size
+    size = min_size + 1
+    next_code = clear + 2
+    table = {}
+    out = bytearray()
+    acc = 0
+    nbits = 0
+
+    def emit(code):
+        nonlocal acc, nbits
+        acc |= code << nbits
+        nbits += size
+        while nbits >= 8:
+            out.append(acc & 0xff)
+            acc >>= 8
+            nbits -= 8
+
+    emit(clear)
+    prefix = data[0]
+    for c in data[1:]:
+        key = prefix << 8 | c
+        code = table.get(key)
+        if code is not None:
+            prefix = code
+            continue
+        emit(prefix)
+        if next_code < 4096:
+            table[key] = next_code
+            next_code += 1
+            if next_code > 1 << size and size < 12:
+                size += 1
+        else:
+            emit(clear)
+            table.clear()
+            next_code = clear + 2
+            size = min_size + 1
+        prefix = c
+    emit(prefix)
+    emit(clear + 1)
+    if nbits:
+        out.append(acc & 0xff)
+    return bytes(out)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+import argparse
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from cache import SolutionCache
+from instances import parse_record
+from solver import choose_engine, min_crossing_with_path
+
+# upper edges of the latency histogram buckets, in milliseconds
+BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+MAX_BODY = 1 << 20
+# largest solve accepted, in the registry's cost units (about a microsecond
+# each): n=200, max_group=3 is near the limit, n=2000 is refused
+MAX_COST = 10 ** 7
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error"}
+
+class BadRequest(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+class SolveService:
+    # solves (times, max_group) over HTTP on a pool of warm worker processes.
+    # Requests for the same instance as one still being solved, in any order,
+    # wait for that result instead of starting another, and answers are kept
+    # in a SolutionCache. Instances whose cheapest exact engine costs more
+    # than max_cost are refused with 413 rather than tying up a worker.
+    #   POST /solve  {"times": [...], "max_group": n} -> {"total", "steps"}
+    #   GET  /stats  counters and per-endpoint latency histograms
+    #   GET  /health
+    def __init__(self, workers=None, cache_size=1024, max_cost=MAX_COST):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_cost = max_cost
+        self.cache = SolutionCache(cache_size)
+        self.pool = None
+        self.server = None
+        self.warming = None
+        self.inflight = {}
+        self.latency = {}
+        self.counts = {"requests": 0, "solved": 0, "coalesced": 0, "cache_hits": 0, "errors": 0}
+        self.started = time.monotonic()
+
+    async def start(self, host="127.0.0.1", port=8765):
+        self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        self.server = await asyncio.start_server(self.handle, host, port)
+        # spawn and warm the workers in the background so the port is
+        # open straight away
+        loop = asyncio.get_running_loop()
+        self.warming = asyncio.gather(*(loop.run_in_executor(self.pool, _warm) for _ in range(self.workers)))
+        return self
+
+    @property
+    def port(self):
+        return self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.warming is not None:
+            await asyncio.gather(self.warming, return_exceptions=True)
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                except BadRequest as e:
+                    await respond(writer, e.status, {"error": str(e)}, False)
+                    break
+                if request is None:
+                    break
+                method, path, headers, body = request
+                started = time.perf_counter()
+                status, payload = await self.route(method, path, body)
+                self.observe(path, time.perf_counter() - started)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                await respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def route(self, method, path, body):
+        self.counts["requests"] += 1
+        if path == "/solve":
+            if method != "POST":
+                return 405, {"error": "use POST"}
+            return await self.solve_request(body)
+        if path in ("/stats", "/health"):
+            if method != "GET":
+                return 405, {"error": "use GET"}
+            return 200, self.stats() if path == "/stats" else {"status": "ok"}
+        return 404, {"error": f"no such endpoint: {path}"}
+
+    async def solve_request(self, body):
+        try:
+            times, max_group = parse_record(json.loads(body))
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            self.counts["errors"] += 1
+            return 400, {"error": f"bad instance: {e}"}
+        try:
+            engine = choose_engine(len(times), max_group)
+        except ValueError as e:
+            self.counts["errors"] += 1
+            return 400, {"error": f"bad instance: {e}"}
+        if self.max_cost is not None and engine.cost(len(times), max_group) > self.max_cost:
+            self.counts["errors"] += 1
+            return 413, {"error": f"instance too large: n={len(times)}, max_group={max_group}"}
+        try:
+            total, steps = await self.solve(times, max_group)
+        except Exception as e:
+            self.counts["errors"] += 1
+            return 500, {"error": f"solver failed: {e!r}"}
+        return 200, {"total": total, "steps": [
+            {"people": group, "direction": direction, "time": t} for group, direction, t in steps]}
+
+    async def solve(self, times, max_group):
+        cached = self.cache.get(times, max_group)
+        if cached is not None:
+            self.counts["cache_hits"] += 1
+            return cached
+        # the cache's key is the sorted instance, so permutations of one
+        # instance share a solve; the worker solves the sorted times and each
+        # caller gets the steps mapped back onto its own people
+        key = self.cache.key(times, max_group)
+        future = self.inflight.get(key)
+        if future is not None:
+            self.counts["coalesced"] += 1
+        else:
+            future = asyncio.get_running_loop().run_in_executor(self.pool, min_crossing_with_path, list(key[0]), max_group)
+            self.inflight[key] = future
+            future.add_done_callback(lambda done: self._solved(key, done))
+        # shielded: a client hanging up must not cancel work others wait on
+        total, steps = await asyncio.shield(future)
+        order = sorted(range(len(times)), key=times.__getitem__)
+        return total, [(sorted(order[p] for p in group), direction, t) for group, direction, t in steps]
+
+    def _solved(self, key, future):
+        del self.inflight[key]
+        if future.cancelled() or future.exception() is not None:
+            return
+        self.counts["solved"] += 1
+        total, steps = future.result()
+        self.cache.put(list(key[0]), key[1], total, steps)
+
+    def observe(self, path, seconds):
+        if path not in ("/solve", "/stats", "/health"):
+            path = "other"
+        entry = self.latency.get(path)
+        if entry is None:
+            entry = self.latency[path] = {"count": 0, "sum_ms": 0.0, "max_ms": 0.0, "buckets": [0] * (len(BUCKETS_MS) + 1)}
+        ms = seconds * 1000
+        entry["count"] += 1
+        entry["sum_ms"] += ms
+        entry["max_ms"] = max(entry["max_ms"], ms)
+        for b, edge in enumerate(BUCKETS_MS):
+            if ms <= edge:
+                break
+        else:
+            b = len(BUCKETS_MS)
+        entry["buckets"][b] += 1
+
+    def stats(self):
+        # histogram counts are cumulative, keyed by each bucket's upper edge
+        latency = {}
+        for path, entry in self.latency.items():
+            running = 0
+            buckets = {}
+            for edge, count in zip(BUCKETS_MS + ("+Inf",), entry["buckets"]):
+                running += count
+                buckets[str(edge)] = running
+            latency[path] = {"count": entry["count"], "mean_ms": round(entry["sum_ms"] / entry["count"], 3),
+                             "max_ms": round(entry["max_ms"], 3), "buckets": buckets}
+        warm = self.warming is not None and self.warming.done()
+        return dict(self.counts, inflight=len(self.inflight), workers=self.workers, warm=warm,
+                    uptime_s=round(time.monotonic() - self.started, 1), latency_ms=latency)
+
+async def read_request(reader):
+    # (method, path, headers, body) of the next request, or None once the
+    # client has closed the connection
+    line = await reader.readline()
+    if not line.strip():
+        return None
+    try:
+        method, target, _ = line.decode("latin-1").split()
+    except ValueError:
+        raise BadRequest(400, "malformed request line")
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+        if len(headers) > 100:
+            raise BadRequest(400, "too many headers")
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        raise BadRequest(400, "bad Content-Length")
+    if length > MAX_BODY:
+        raise BadRequest(413, "request body too large")
+    body = await reader.readexactly(length) if length > 0 else b""
+    return method, target.split("?", 1)[0], headers, body
+
+async def respond(writer, status, payload, keep_alive=True):
+    body = json.dumps(payload, separators=(",", ":")).encode()
+    head = (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    writer.write(head.encode("latin-1") + body)
+    await writer.drain()
+
+def _warm():
+    # first solve in a fresh worker: imports and allocations happen here
+    # rather than on someone's request
+    min_crossing_with_path([1, 2, 5, 10], 3)
+    return os.getpid()
+
+async def serve(host, port, workers, max_cost=MAX_COST):
+    service = await SolveService(workers, max_cost=max_cost).start(host, port)
+    print(f"Serving on http://{host}:{service.port} with {service.workers} workers", flush=True)
+    try:
+        await service.server.serve_forever()
+    finally:
+        await service.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the bridge and torch solver over HTTP on this machine.")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on (default: localhost only)")
+    parser.add_argument("-p", "--port", type=int, default=8765)
+    parser.add_argument("-w", "--workers", type=int, help="solver processes (default: one per CPU)")
+    parser.add_argument("--max-cost", type=float, default=MAX_COST,
+                        help=f"refuse instances the solver estimates above this many operations (default: {MAX_COST:g})")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.max_cost))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+# bridge and torch solvers. Every engine takes (times, max_group, stats) and
+# returns (total, steps), steps being (people, "->" or "<-", time) tuples;
+# min_crossing_with_path picks the cheapest exact one for the instance.
+from math import comb, log2
+from .registry import ENGINES, Engine, register_engine, choose_engine
+from .greedy import greedy_crossing_with_path
+from .dp import dp_crossing_with_path, dp_plans
+from .bounds import escort_crossing_with_path, crossing_lower_bound
+from .search import (dijkstra_crossing_with_path, astar_crossing_with_path,
+                     bidirectional_crossing_with_path, bidirectional_astar_crossing_with_path)
+
+def min_crossing_with_path(times, max_group, stats=None):
+    return choose_engine(len(times), max_group).solve(times, max_group, stats)
+
+def _greedy(times, max_group, stats=None):
+    return greedy_crossing_with_path(times, stats)
+
+def _escort(times, max_group, stats=None):
+    return escort_crossing_with_path(times, max_group)
+
+def _dp_cost(n, c):
+    # one search per shuttle count k, over runs of waiting people and counts
+    # of shuttles on the start side, each state trying O(c^2) loads
+    if n <= c:
+        return n
+    return (c + 1) ** 2 * sum((n - k + 1) ** 2 * (k + 1) for k in range(1, min(n - 1, c) + 1))
+
+def _subset_cost(n, c):
+    # every (mask, side) state, each trying every group on the torch side
+    return (2 << n) * sum(comb(n, i) for i in range(1, min(n, c) + 1))
+
+register_engine("greedy", _greedy, lambda n, c: n * log2(n + 2) / 4, accepts=lambda n, c: c == 2)
+register_engine("dp", dp_crossing_with_path, _dp_cost)
+register_engine("astar", astar_crossing_with_path, _subset_cost)
+register_engine("bidirectional_astar", bidirectional_astar_crossing_with_path, lambda n, c: _subset_cost(n, c) * 2)
+register_engine("bidirectional", bidirectional_crossing_with_path, lambda n, c: _subset_cost(n, c) * 3)
+register_engine("dijkstra", dijkstra_crossing_with_path, lambda n, c: _subset_cost(n, c) * 4)
+register_engine("escort", _escort, lambda n, c: n, exact=False)
@@ -0,0 +1,52 @@
+def escort_crossing_with_path(times, max_group):
+    # quick upper bound for any capacity: the fastest person escorts the
+    # slowest max_group - 1 people over and comes back for the next load
+    n = len(times)
+    if n == 0:
+        return None, []
+    order = sorted(range(n), key=lambda i: times[i])
+    if n <= max_group:
+        return times[order[-1]], [(sorted(order), "->", times[order[-1]])]
+    if max_group < 2:
+        return None, []
+    fastest = order[0]
+    steps = []
+    total = 0
+    remaining = n
+    while remaining > max_group:
+        group = [fastest] + order[remaining - max_group + 1:remaining]
+        t = times[order[remaining - 1]]
+        steps.append((sorted(group), "->", t))
+        steps.append(([fastest], "<-", times[fastest]))
+        total += t + times[fastest]
+        remaining -= max_group - 1
+    t = times[order[remaining - 1]]
+    steps.append((sorted(order[:remaining]), "->", t))
+    return total + t, steps
+
+def crossing_lower_bound(times, max_group):
+    # admissible bound on the optimal total, also used as the A* heuristic
+    return _trip_bound(sorted(times, reverse=True), max_group, 0, min(times) if times else 0)
+
+def _trip_bound(waiting, max_group, side, fastest):
+    # waiting holds the start-side times, slowest first. Every forward trip
+    # carries at most max_group people, so it needs at least every
+    # max_group-th of them, and every trip but the last nets at most
+    # max_group - 1 people, each followed by a return costing at least fastest
+    if not waiting:
+        return 0
+    h = sum(waiting[::max_group])
+    m = len(waiting) + side
+    if m > max_group and max_group > 1:
+        returns = -(-(m - max_group) // (max_group - 1))
+    else:
+        returns = 0
+    return h + (returns + side) * fastest
+
+def _bound_to_far_side(times, max_group):
+    by_time = sorted(range(len(times)), key=lambda i: -times[i])
+    fastest = min(times) if times else 0
+
+    def heuristic(mask, side):
+        return _trip_bound([times[i] for i in by_time if (mask >> i) & 1], max_group, side, fastest)
+    return heuristic
@@ -0,0 +1,148 @@
+import heapq
+import time
+
+def dp_crossing_with_path(times, max_group, stats=None):
+    best = (None, [])
+    for best in dp_plans(times, max_group, stats):
+        pass
+    return best
+
+def dp_plans(times, max_group, stats=None):
+    # exact solver for any capacity. People are sorted by time; the k fastest
+    # (k <= max_group) act as shuttles and everyone else crosses exactly once,
+    # the one-way people still waiting always being a contiguous run of the
+    # sorted order, and the shuttles on the start side always the fastest m.
+    # That makes the state the ends of that run plus a shuttle count, so the
+    # work is polynomial in both n and max_group: O(n^2 c^2) states over all
+    # k, each with O(c^2) moves.
+    # Yields (total, steps) each time a better plan is found; the last is optimal.
+    counts = {"pops": 0, "stale": 0, "expanded": 0, "pushed": 0, "relaxations": 0, "generated": 0}
+    if stats is not None:
+        stats.update(counts)
+    timing = getattr(stats, "timing", False)
+    progress = getattr(stats, "progress", None)
+    every = getattr(stats, "every", 1024)
+    n = len(times)
+    if n == 0:
+        return
+    order = sorted(range(n), key=lambda i: times[i])
+    t = [times[i] for i in order]
+    if n <= max_group:
+        yield t[-1], [(list(range(n)), "->", t[-1])]
+        return
+    if timing:
+        counts["time_search"] = counts["time_reconstruct"] = 0.0
+    best = None
+    try:
+        for k in range(1, min(n - 1, max_group) + 1):
+            if timing:
+                clock = time.perf_counter()
+            found = _shuttle_search(t, k, max_group, counts, best, progress, every)
+            if timing:
+                counts["time_search"] += time.perf_counter() - clock
+            if found is None or (best is not None and found[0] >= best):
+                continue
+            best = found[0]
+            if timing:
+                clock = time.perf_counter()
+            steps = []
+            for group, direction in found[1]:
+                participants = sorted(order[p] for p in group)
+                steps.append((participants, direction, max(t[p] for p in group)))
+            if timing:
+                counts["time_reconstruct"] += time.perf_counter() - clock
+            yield best, steps
+    finally:
+        if stats is not None:
+            stats.update(counts)
+
+def _shuttle_search(t, k, max_group, counts, bound=None, progress=None, every=1024):
+    # t is sorted; positions 0..k-1 are shuttles, k..n-1 cross once.
+    # A forward trip takes one-way people from both ends of those still
+    # waiting: the slowest ones, and fast ones riding along in seats a trip
+    # has paid for anyway. So the waiting people are always positions
+    # lo..hi-1. Shuttles 0..m-1 are on the start side: a trip takes the
+    # slowest r of them and shuttle m, the fastest on the far side, brings
+    # the torch back, so they stay a prefix. The state is (lo, hi, m, torch
+    # side). Searched with A*: see _waiting_bound.
+    n = len(t)
+    start = (k, n, k, 0)
+    chain = _waiting_bound(t, max_group)
+    pq = [(chain(k, n, 0), 0, start)]
+    dist = {start: 0}
+    prev = {}
+    counts["pushed"] += 1
+    while pq:
+        estimate, cost, state = heapq.heappop(pq)
+        counts["pops"] += 1
+        if dist[state] < cost:
+            counts["stale"] += 1
+            continue
+        if bound is not None and estimate >= bound:
+            return None
+        lo, hi, near, side = state
+        if lo == hi and not near and side:
+            path = []
+            cur = state
+            while cur != start:
+                cur, r, slow, fast = prev[cur]
+                lo, hi, near, side = cur
+                if side == 0:
+                    path.append((list(range(near - r, near)) + list(range(lo, lo + fast)) + list(range(hi - slow, hi)), "->"))
+                else:
+                    path.append(([near], "<-"))
+            path.reverse()
+            return cost, path
+        counts["expanded"] += 1
+        if progress is not None and counts["expanded"] % every == 0:
+            progress(counts["expanded"], cost)
+        if side == 0:
+            waiting = hi - lo
+            for r in range(0, min(near, max_group) + 1):
+                new_near = near - r
+                # shuttles near - r .. near - 1 go; the slowest sets the pace
+                paid = t[near - 1] if r else 0
+                seats = min(max_group - r, waiting)
+                for slow in range(0, seats + 1):
+                    for fast in range(0 if slow or r else 1, seats - slow + 1):
+                        if slow:
+                            trip = t[hi - 1] if t[hi - 1] > paid else paid
+                        elif fast:
+                            trip = t[lo + fast - 1] if t[lo + fast - 1] > paid else paid
+                        else:
+                            trip = paid
+                        _relax(pq, dist, prev, counts, state, (lo + fast, hi - slow, new_near, 1),
+                               cost + trip, chain(lo + fast, hi - slow, 1), r, slow, fast)
+        elif near < k:
+            # the fastest shuttle on the far side brings the torch back alone
+            _relax(pq, dist, prev, counts, state, (lo, hi, near + 1, 0),
+                   cost + t[near], chain(lo, hi, 0), near, 0, 0)
+    return None
+
+def _waiting_bound(t, max_group):
+    # lower bound on the trips still needed by the one-way people lo..hi-1:
+    # at best they go in full trips slowest first, costing every max_group-th
+    # time from the top, with the fastest person bringing the torch back
+    # between trips. A trip that takes people from either end lowers it by
+    # no more than that trip costs, so it is consistent.
+    # chained[i] sums t[i], t[i - max_group], t[i - 2 * max_group], ...
+    chained = []
+    for i, x in enumerate(t):
+        chained.append(x + (chained[i - max_group] if i >= max_group else 0))
+    def bound(lo, hi, side):
+        if lo == hi:
+            return 0
+        trips = -(-(hi - lo) // max_group)
+        below = hi - 1 - trips * max_group
+        returns = trips if side else trips - 1
+        return chained[hi - 1] - (chained[below] if below >= 0 else 0) + returns * t[0]
+    return bound
+
+def _relax(pq, dist, prev, counts, state, new_state, new_cost, estimate, r, slow, fast):
+    counts["generated"] += 1
+    if new_cost < dist.get(new_state, float('inf')):
+        dist[new_state] = new_cost
+        prev[new_state] = (state, r, slow, fast)
+        heapq.heappush(pq, (new_cost + estimate, new_cost, new_state))
+        counts["pushed"] += 1
+        counts["relaxations"] += 1
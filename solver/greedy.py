@@ -0,0 +1,51 @@
+def greedy_crossing_with_path(times, stats=None):
+    # optimal strategy for a bridge that holds two people: for each pair of
+    # slowest people pick the cheaper of "two fastest shuttle" and "fastest escorts"
+    if stats is not None:
+        stats["expanded"] = 0
+        stats["pushed"] = 0
+    n = len(times)
+    if n == 0:
+        return None, []
+    order = sorted(range(n), key=times.__getitem__)
+    steps = []
+    append = steps.append
+
+    a = order[0]
+    ta = times[a]
+    if n == 1:
+        return ta, [([a], "->", ta)]
+    b = order[1]
+    tb = times[b]
+    # the two fastest shuttle or the fastest escorts: either way the slower
+    # person of every pair is known, so steps are built without a max()
+    ab = [a, b] if a < b else [b, a]
+    back_a = ([a], "<-", ta)
+    back_b = ([b], "<-", tb)
+    total = 0
+    remaining = n
+    while remaining > 3:
+        y = order[remaining - 2]
+        z = order[remaining - 1]
+        ty = times[y]
+        tz = times[z]
+        if tb + tb <= ta + ty:
+            append((ab, "->", tb))
+            append(back_a)
+            append(([y, z] if y < z else [z, y], "->", tz))
+            append(back_b)
+            total += ta + 2 * tb + tz
+        else:
+            append(([a, z] if a < z else [z, a], "->", tz))
+            append(back_a)
+            append(([a, y] if a < y else [y, a], "->", ty))
+            append(back_a)
+            total += 2 * ta + ty + tz
+        remaining -= 2
+    if remaining == 3:
+        c = order[2]
+        append(([a, c] if a < c else [c, a], "->", times[c]))
+        append(back_a)
+        total += times[c] + ta
+    append((ab, "->", tb))
+    return total + tb, steps
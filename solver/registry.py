@@ -0,0 +1,30 @@
+class Engine:
+    # a solver plus where it applies. solve(times, max_group, stats) returns
+    # (total, steps); an exact engine's plans are optimal for every instance
+    # it accepts. cost(n, max_group) is a rough operation count, only used
+    # to rank engines against each other.
+    def __init__(self, name, solve, cost, accepts=None, exact=True):
+        self.name = name
+        self.solve = solve
+        self.cost = cost
+        self.exact = exact
+        self._accepts = accepts
+
+    def accepts(self, n, max_group):
+        return self._accepts is None or self._accepts(n, max_group)
+
+    def __repr__(self):
+        return f"Engine({self.name!r})"
+
+ENGINES = {}
+
+def register_engine(name, solve, cost, accepts=None, exact=True):
+    engine = ENGINES[name] = Engine(name, solve, cost, accepts, exact)
+    return engine
+
+def choose_engine(n, max_group, exact=True):
+    # cheapest registered engine that takes this instance
+    candidates = [e for e in ENGINES.values() if e.accepts(n, max_group) and (e.exact or not exact)]
+    if not candidates:
+        raise ValueError(f"no engine for n={n}, max_group={max_group}")
+    return min(candidates, key=lambda e: e.cost(n, max_group))
@@ -0,0 +1,344 @@
+import heapq
+import itertools
+import time
+from .statestore import make_state_store
+from .bounds import _bound_to_far_side
+
+# masks up to this many people get a fully precomputed group-time table
+TABLE_LIMIT = 20
+NUMPY_TABLE_SIZE = 1 << 12
+
+def dijkstra_crossing_with_path(times, max_group, stats=None):
+    return _subset_search(times, max_group, False, stats)
+
+def astar_crossing_with_path(times, max_group, stats=None):
+    # same subset search, guided by a lower bound and with people of equal
+    # time treated as interchangeable
+    return _subset_search(times, max_group, True, stats)
+
+def bidirectional_crossing_with_path(times, max_group, stats=None):
+    # Dijkstra from both ends at once, meeting in the middle
+    return _bidirectional_search(times, max_group, False, stats)
+
+def bidirectional_astar_crossing_with_path(times, max_group, stats=None):
+    return _bidirectional_search(times, max_group, True, stats)
+
+def _subset_search(times, max_group, astar, stats):
+    # states are numbered mask * 2 + side
+    timing = getattr(stats, "timing", False)
+    progress = getattr(stats, "progress", None)
+    every = getattr(stats, "every", 1024)
+    if timing:
+        clock = time.perf_counter()
+    n = len(times)
+    ALL = (1 << n) - 1
+    start = ALL * 2
+    target = 1
+    if astar:
+        canonical = _canonicalizer(times)
+        heuristic = _bound_to_far_side(times, max_group)
+    else:
+        canonical = None
+    pops = stale = expanded = generated = 0
+    pushed = 1
+    expand_time = 0.0
+    integral = all(isinstance(t, int) for t in times)
+    store = make_state_store(2 << n, integral, sparse=astar)
+    store.update(start, 0, -1, 0)
+    group_time = _group_time_table(times)
+    pq = [(heuristic(ALL, 0) if astar else 0, 0, start)]
+    if timing:
+        phases = {"time_setup": time.perf_counter() - clock}
+        clock = time.perf_counter()
+    found = None
+    while pq:
+        bound, cost, state = heapq.heappop(pq)
+        pops += 1
+        if store.get(state) < cost:
+            stale += 1
+            continue
+        if state == target:
+            found = cost
+            break
+        expanded += 1
+        if progress is not None and expanded % every == 0:
+            progress(expanded, bound)
+        if timing:
+            expand_start = time.perf_counter()
+        mask = state >> 1
+        side = state & 1
+        torch = mask if side == 0 else ALL ^ mask
+        for moved in _groups(torch, max_group):
+            generated += 1
+            t = group_time[moved]
+            new_mask = mask ^ moved
+            if canonical is not None:
+                new_mask = canonical(new_mask)
+            new_side = 1 - side
+            new_state = new_mask * 2 + new_side
+            new_cost = cost + t
+            if new_cost < store.get(new_state, float('inf')):
+                store.update(new_state, new_cost, state, moved)
+                priority = new_cost + heuristic(new_mask, new_side) if astar else new_cost
+                heapq.heappush(pq, (priority, new_cost, new_state))
+                pushed += 1
+        if timing:
+            expand_time += time.perf_counter() - expand_start
+    if timing:
+        phases["time_expand"] = expand_time
+        phases["time_heap"] = time.perf_counter() - clock - expand_time
+        clock = time.perf_counter()
+    steps = [] if found is None else _subset_steps(times, store, start, target, canonical)
+    if stats is not None:
+        stats.update(pops=pops, stale=stale, expanded=expanded, pushed=pushed,
+                     relaxations=pushed - 1, generated=generated)
+        if timing:
+            phases["time_reconstruct"] = time.perf_counter() - clock
+            stats.update(phases)
+    return found, steps
+
+def _bidirectional_search(times, max_group, astar, stats):
+    # the move graph is symmetric: a group that crossed can cross back with
+    # the torch at the same cost, so the backward search from (0, 1) expands
+    # states exactly like the forward one. Every relaxation that reaches a
+    # state the other side has seen offers a full path; the best of them,
+    # mu, is optimal once the two queue heads add up to mu. The A* mode
+    # orders both queues by the average of the two lower bounds (to the far
+    # side and back to the start), which keeps that stopping rule exact since
+    # the bounds are consistent.
+    timing = getattr(stats, "timing", False)
+    progress = getattr(stats, "progress", None)
+    every = getattr(stats, "every", 1024)
+    if timing:
+        clock = time.perf_counter()
+    n = len(times)
+    ALL = (1 << n) - 1
+    start = ALL * 2
+    target = 1
+    if astar:
+        canonical = _canonicalizer(times)
+        to_far = _bound_to_far_side(times, max_group)
+
+        # from the target's end the mirror image of the same bound applies:
+        # whoever is on the far side has to be brought back
+        def potential(mask, side):
+            return (to_far(mask, side) - to_far(ALL ^ mask, 1 - side)) / 2
+        heuristics = (potential, lambda mask, side: -potential(mask, side))
+    else:
+        canonical = None
+        heuristics = (lambda mask, side: 0,) * 2
+    pops = stale = generated = 0
+    expanded = [0, 0]
+    pushed = 2
+    expand_time = 0.0
+    integral = all(isinstance(t, int) for t in times)
+    stores = (make_state_store(2 << n, integral, sparse=astar), make_state_store(2 << n, integral, sparse=astar))
+    stores[0].update(start, 0, -1, 0)
+    stores[1].update(target, 0, -1, 0)
+    group_time = _group_time_table(times)
+    queues = ([(heuristics[0](ALL, 0), 0, start)], [(heuristics[1](0, 1), 0, target)])
+    if timing:
+        phases = {"time_setup": time.perf_counter() - clock}
+        clock = time.perf_counter()
+    best = float('inf')
+    meet = None
+    while True:
+        # drop stale heads first so the stopping test sees live bounds
+        for d in (0, 1):
+            queue = queues[d]
+            while queue and stores[d].get(queue[0][2]) < queue[0][1]:
+                heapq.heappop(queue)
+                pops += 1
+                stale += 1
+        if not queues[0] or not queues[1]:
+            break
+        head = (queues[0][0][0], queues[1][0][0])
+        if head[0] + head[1] >= best:
+            break
+        # grow the side that is further behind
+        d = 0 if head[0] <= head[1] else 1
+        store = stores[d]
+        other = stores[1 - d]
+        heuristic = heuristics[d]
+        bound, cost, state = heapq.heappop(queues[d])
+        pops += 1
+        expanded[d] += 1
+        if progress is not None and (expanded[0] + expanded[1]) % every == 0:
+            progress(expanded[0] + expanded[1], min(head))
+        if timing:
+            expand_start = time.perf_counter()
+        mask = state >> 1
+        side = state & 1
+        torch = mask if side == 0 else ALL ^ mask
+        for moved in _groups(torch, max_group):
+            generated += 1
+            new_mask = mask ^ moved
+            if canonical is not None:
+                new_mask = canonical(new_mask)
+            new_side = 1 - side
+            new_state = new_mask * 2 + new_side
+            new_cost = cost + group_time[moved]
+            if new_cost < store.get(new_state, float('inf')):
+                store.update(new_state, new_cost, state, moved)
+                priority = new_cost + heuristic(new_mask, new_side) if astar else new_cost
+                heapq.heappush(queues[d], (priority, new_cost, new_state))
+                pushed += 1
+                through = new_cost + other.get(new_state, float('inf'))
+                if through < best:
+                    best = through
+                    meet = new_state
+        if timing:
+            expand_time += time.perf_counter() - expand_start
+    if timing:
+        phases["time_expand"] = expand_time
+        phases["time_heap"] = time.perf_counter() - clock - expand_time
+        clock = time.perf_counter()
+    found = None if meet is None else best
+    steps = []
+    if meet is not None:
+        # start -> meet from the forward parents, then meet -> target
+        # following the backward parents
+        path = _subset_path(times, stores[0], meet, start)
+        path.reverse()
+        path += _subset_path(times, stores[1], meet, target)
+        steps = _path_steps(times, path, canonical)
+    if stats is not None:
+        stats.update(pops=pops, stale=stale, expanded=expanded[0] + expanded[1], pushed=pushed,
+                     relaxations=pushed - 2, generated=generated,
+                     expanded_forward=expanded[0], expanded_backward=expanded[1])
+        if timing:
+            phases["time_reconstruct"] = time.perf_counter() - clock
+            stats.update(phases)
+    return found, steps
+
+def _subset_steps(times, store, start, target, canonical):
+    path = _subset_path(times, store, target, start)
+    path.reverse()
+    return _path_steps(times, path, canonical)
+
+def _subset_path(times, store, state, root):
+    # groups moved along the parent chain from state back to the search root
+    n = len(times)
+    path = []
+    cur = state
+    while cur != root:
+        move = store.move(cur)
+        path.append(tuple(i for i in range(n) if (move >> i) & 1))
+        cur = store.parent(cur)
+    return path
+
+def _path_steps(times, path, canonical):
+    if canonical is not None:
+        path = _uncanonicalize(times, path)
+    steps = []
+    cur_side = 0
+    for group in path:
+        t = max(times[i] for i in group)
+        direction = "->" if cur_side == 0 else "<-"
+        steps.append((list(group), direction, t))
+        cur_side = 1 - cur_side
+    return steps
+
+def _groups(torch, max_group):
+    # bitmasks of every group of at most max_group people on the torch side
+    if bin(torch).count("1") <= max_group:
+        sub = torch
+        while sub:
+            yield sub
+            sub = (sub - 1) & torch
+        return
+    bits = []
+    rest = torch
+    while rest:
+        low = rest & -rest
+        bits.append(low)
+        rest ^= low
+    for k in range(1, max_group + 1):
+        for group in itertools.combinations(bits, k):
+            yield sum(group)
+
+def _group_time_table(times):
+    # slowest time of every group, indexed by the group's bitmask
+    n = len(times)
+    if n > TABLE_LIMIT:
+        return _GroupTimes(times)
+    size = 1 << n
+    np = _numpy() if size >= NUMPY_TABLE_SIZE else None
+    if np is not None:
+        masks = np.arange(size, dtype=np.int64)
+        table = np.zeros(size, dtype=np.asarray(times).dtype)
+        for i, t in enumerate(times):
+            np.maximum(table, ((masks >> i) & 1) * t, out=table)
+        return table.tolist()
+    table = [0] * size
+    for mask in range(1, size):
+        low = mask & -mask
+        t = times[low.bit_length() - 1]
+        rest = table[mask ^ low]
+        table[mask] = t if t > rest else rest
+    return table
+
+def _numpy():
+    # numpy is optional and slow to import, so it is only loaded once a
+    # table is big enough to use it
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+class _GroupTimes(dict):
+    # lazily filled table for instances too large to enumerate every mask
+    def __init__(self, times):
+        super().__init__()
+        self.times = times
+
+    def __missing__(self, mask):
+        t = max(self.times[i] for i in range(mask.bit_length()) if (mask >> i) & 1)
+        self[mask] = t
+        return t
+
+def _canonicalizer(times):
+    # people with equal times are interchangeable: keep only how many of each
+    # time are on the start side by always using the lowest indices
+    blocks = {}
+    for i, t in enumerate(times):
+        blocks.setdefault(t, []).append(i)
+    dups = []
+    for members in blocks.values():
+        if len(members) > 1:
+            block_mask = 0
+            prefixes = [0]
+            for i in members:
+                block_mask |= (1 << i)
+                prefixes.append(block_mask)
+            dups.append((block_mask, prefixes))
+
+    def canonical(mask):
+        for block_mask, prefixes in dups:
+            count = bin(mask & block_mask).count("1")
+            mask = (mask & ~block_mask) | prefixes[count]
+        return mask
+    return canonical
+
+def _uncanonicalize(times, path):
+    # groups along a canonical path name representatives; replay the plan and
+    # swap in whoever of that time is actually on the torch side
+    n = len(times)
+    on_start = set(range(n))
+    side = 0
+    real_path = []
+    for group in path:
+        here = on_start if side == 0 else set(range(n)) - on_start
+        real = []
+        for i in group:
+            person = min(p for p in here if times[p] == times[i] and p not in real)
+            real.append(person)
+        real.sort()
+        if side == 0:
+            on_start.difference_update(real)
+        else:
+            on_start.update(real)
+        side = 1 - side
+        real_path.append(tuple(real))
+    return real_path
@@ -0,0 +1,71 @@
+from array import array
+
+# largest state space we are willing to preallocate flat buffers for
+DENSE_LIMIT = 1 << 24
+
+class ArrayStateStore:
+    # flat buffers indexed by state number: best known cost, parent state and
+    # the move that led here, encoded as an int by the solver
+    def __init__(self, size, integral=True):
+        if integral:
+            self.unset = (1 << 63) - 1
+            self.dist = array("q", [self.unset]) * size
+        else:
+            self.unset = float("inf")
+            self.dist = array("d", [self.unset]) * size
+        self.parents = array("q", [-1]) * size
+        self.moves = array("q", [0]) * size
+        self.count = 0
+
+    def get(self, index, default=None):
+        d = self.dist[index]
+        return default if d == self.unset else d
+
+    def update(self, index, cost, parent, move):
+        if self.dist[index] == self.unset:
+            self.count += 1
+        self.dist[index] = cost
+        self.parents[index] = parent
+        self.moves[index] = move
+
+    def parent(self, index):
+        return self.parents[index]
+
+    def move(self, index):
+        return self.moves[index]
+
+    def __contains__(self, index):
+        return self.dist[index] != self.unset
+
+    def __len__(self):
+        return self.count
+
+class HashStateStore:
+    # same interface for state spaces too large or too sparse to preallocate
+    def __init__(self):
+        self.dist = {}
+        self.links = {}
+
+    def get(self, index, default=None):
+        return self.dist.get(index, default)
+
+    def update(self, index, cost, parent, move):
+        self.dist[index] = cost
+        self.links[index] = (parent, move)
+
+    def parent(self, index):
+        return self.links[index][0]
+
+    def move(self, index):
+        return self.links[index][1]
+
+    def __contains__(self, index):
+        return index in self.dist
+
+    def __len__(self):
+        return len(self.dist)
+
+def make_state_store(size, integral=True, sparse=False):
+    if sparse or size > DENSE_LIMIT:
+        return HashStateStore()
+    return ArrayStateStore(size, integral)
@@ -0,0 +1,42 @@
+import random
+from cache import SolutionCache
+from solver import min_crossing_with_path
+from test_solver import check_plan
+
+def test_permuted_hit_maps_steps_to_callers_people():
+    cache = SolutionCache()
+    times = [10, 1, 5, 2]
+    total, steps = cache.solve(times, 2)
+    rng = random.Random(1)
+    for _ in range(20):
+        order = list(range(len(times)))
+        rng.shuffle(order)
+        permuted = [times[i] for i in order]
+        hit = cache.get(permuted, 2)
+        assert hit is not None and hit[0] == total == 17
+        check_plan(permuted, 2, *hit)
+    assert cache.misses == 1
+
+def test_int_and_float_times_are_separate_entries():
+    cache = SolutionCache()
+    cache.solve([1.0, 2.0, 5.0, 10.0], 2)
+    total, steps = cache.solve([1, 2, 5, 10], 2)
+    assert cache.hits == 0
+    assert isinstance(total, int) and all(isinstance(t, int) for _, _, t in steps)
+    total, steps = cache.get([10.0, 5.0, 2.0, 1.0], 2)
+    assert isinstance(total, float) and total == 17
+
+def test_sqlite_round_trip(tmp_path):
+    path = str(tmp_path / "solutions.db")
+    instances = [([1, 2, 5, 10], 2), ([3, 1, 4, 1, 5, 9, 2, 6], 3), ([1.5, 2.25, 7.0], 2), ([4, 2.5, 8, 1], 3)]
+    cache = SolutionCache(path=path)
+    expected = [cache.solve(times, max_group) for times, max_group in instances]
+    cache.close()
+    cache = SolutionCache(path=path)
+    for (times, max_group), (total, steps) in zip(instances, expected):
+        hit = cache.get(times[::-1], max_group)
+        assert hit is not None
+        assert hit[0] == total and type(hit[0]) is type(total)
+        check_plan(times[::-1], max_group, *hit)
+    assert cache.hits == len(instances)
+    cache.close()
@@ -0,0 +1,68 @@
+import random
+import pytest
+import evaluate
+from evaluate import check_plan, encode_plans, evaluate_plans
+from solver import min_crossing_with_path
+
+np = pytest.importorskip("numpy")
+
+def _mutated(rng, n, row):
+    # a copy of a padded plan with a few steps replaced: random groups, some
+    # with bits above the last person, early zero masks and masks after the
+    # padding
+    row = list(row)
+    for _ in range(rng.randint(0, 3)):
+        k = rng.randrange(len(row))
+        kind = rng.randrange(4)
+        if kind == 0:
+            row[k] = rng.getrandbits(n) & rng.getrandbits(n)
+        elif kind == 1 and n < evaluate.MAX_PEOPLE:
+            row[k] = 1 << rng.randrange(n, evaluate.MAX_PEOPLE)
+        elif kind == 2:
+            row[k] = 0
+        else:
+            row[-1] = rng.getrandbits(n) or 1
+    return row
+
+def _compare(times, max_group, plans):
+    costs, violation = evaluate_plans(times, max_group, plans)
+    for row, cost, first in zip(np.asarray(plans).tolist(), costs, violation):
+        expected_cost, expected_first = check_plan(times, max_group, row)
+        assert first == expected_first, (times, max_group, row)
+        assert cost == pytest.approx(expected_cost), (times, max_group, row)
+
+def test_evaluate_matches_check_plan():
+    rng = random.Random(4)
+    for trial in range(100):
+        n = rng.randint(1, 24) if trial % 10 else evaluate.MAX_PEOPLE - trial // 10
+        max_group = 2 if n > 24 else rng.randint(1, 4)
+        if trial % 4 == 0:
+            times = [round(rng.uniform(0, 50), 2) for _ in range(n)]
+        else:
+            times = [rng.randint(1, 50) for _ in range(n)]
+        length = 2 * n + 3
+        total, steps = min_crossing_with_path(times, max_group)
+        if total is None:
+            base = [0] * length
+        else:
+            base = encode_plans([steps], length)[0].tolist()
+        plans = [base] + [_mutated(rng, n, base) for _ in range(60)]
+        _compare(times, max_group, np.array(plans, dtype=np.uint64))
+        if total is not None:
+            costs, violation = evaluate_plans(times, max_group, encode_plans([steps]))
+            assert violation[0] == -1 and costs[0] == pytest.approx(total)
+
+def test_evaluate_across_blocks(monkeypatch):
+    monkeypatch.setattr(evaluate, "BLOCK", 7)
+    rng = random.Random(5)
+    times = [rng.randint(1, 30) for _ in range(20)]
+    total, steps = min_crossing_with_path(times, 3)
+    base = encode_plans([steps], 45)[0].tolist()
+    plans = np.array([base] + [_mutated(rng, 20, base) for _ in range(50)], dtype=np.uint64)
+    _compare(times, 3, plans)
+
+def test_plans_of_every_length():
+    times = [1, 2, 5, 10]
+    plans = [[], [([0, 1], "->", 2)], [([0, 1], "->", 2), ([0], "<-", 1)],
+             min_crossing_with_path(times, 2)[1]]
+    _compare(times, 2, encode_plans(plans, 7))
@@ -0,0 +1,45 @@
+import random
+from incremental import IncrementalSolver
+from solver import dijkstra_crossing_with_path
+from test_solver import check_plan
+
+def test_edits_match_dijkstra():
+    rng = random.Random(6)
+    for _ in range(60):
+        max_group = rng.randint(2, 5)
+        times = [rng.randint(1, 20) for _ in range(rng.randint(1, 8))]
+        solver = IncrementalSolver(times, max_group)
+        for _ in range(6):
+            op = rng.random()
+            if op < 0.4:
+                i = rng.randrange(len(times))
+                times[i] = rng.randint(1, 20)
+                solver.set_time(i, times[i])
+            elif op < 0.7 or len(times) == 1:
+                i = rng.randint(0, len(times))
+                times.insert(i, rng.randint(1, 20))
+                solver.insert(times[i], i)
+            else:
+                i = rng.randrange(len(times))
+                del times[i]
+                solver.remove(i)
+            total, steps = solver.solve()
+            assert total == dijkstra_crossing_with_path(times, max_group)[0], (times, max_group)
+            check_plan(times, max_group, total, steps)
+
+def test_update_matches_dijkstra():
+    rng = random.Random(7)
+    times = [rng.randint(1, 50) for _ in range(9)]
+    solver = IncrementalSolver(times, 3)
+    for _ in range(20):
+        new = list(times)
+        if rng.random() < 0.5:
+            new[rng.randrange(len(new))] = rng.randint(1, 50)
+        elif len(new) < 10:
+            new.insert(rng.randint(0, len(new)), rng.randint(1, 50))
+        else:
+            del new[rng.randrange(len(new))]
+        times = new
+        total, steps = solver.update(times).solve()
+        assert total == dijkstra_crossing_with_path(times, 3)[0], times
+        check_plan(times, 3, total, steps)
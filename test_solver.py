@@ -0,0 +1,44 @@
+import random
+from solver import dp_crossing_with_path, dijkstra_crossing_with_path, min_crossing_with_path
+
+def check_plan(times, max_group, total, steps):
+    near = set(range(len(times)))
+    spent = 0
+    for k, (group, direction, t) in enumerate(steps):
+        assert direction == ("->" if k % 2 == 0 else "<-")
+        here = near if direction == "->" else set(range(len(times))) - near
+        assert group and len(group) <= max_group and set(group) <= here
+        assert t == max(times[i] for i in group)
+        near ^= set(group)
+        spent += t
+    assert not near
+    assert spent == total
+
+def test_dp_known_instances():
+    for times, max_group, expected in [([4, 5, 8, 8, 8, 15, 26, 32, 40, 42, 45], 3, 119),
+                                       ([10, 12, 22, 23, 24, 27, 29, 34, 34, 45, 48], 3, 195),
+                                       ([6, 6, 9, 9, 17, 21, 26, 31, 35, 50, 50], 3, 140)]:
+        total, steps = dp_crossing_with_path(times, max_group)
+        assert total == expected
+        check_plan(times, max_group, total, steps)
+
+def test_dp_matches_dijkstra():
+    rng = random.Random(2)
+    for _ in range(40):
+        n = rng.randint(10, 12)
+        max_group = rng.randint(3, 5)
+        times = [rng.randint(1, rng.choice((10, 50, 1000))) for _ in range(n)]
+        total, steps = dp_crossing_with_path(times, max_group)
+        assert total == dijkstra_crossing_with_path(times, max_group)[0], (times, max_group)
+        check_plan(times, max_group, total, steps)
+
+def test_small_instances_match_dijkstra():
+    rng = random.Random(3)
+    for _ in range(300):
+        n = rng.randint(0, 8)
+        max_group = rng.randint(2, 5)
+        times = [rng.randint(1, 20) for _ in range(n)]
+        total, steps = min_crossing_with_path(times, max_group)
+        assert total == dijkstra_crossing_with_path(times, max_group)[0], (times, max_group)
+        if n:
+            check_plan(times, max_group, total, steps)
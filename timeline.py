@@ -0,0 +1,103 @@
+import math
+
+# people sit in a grid centered on LEFT_X and cross to the same cell at RIGHT_X
+LEFT_X = 120
+RIGHT_X = 780
+SIDE_WIDTH = 220
+BRIDGE_Y = 180
+# the scene drawn around them: the bridge, its label, and at BASE_GAP
+# spacing a person's radius and half the torch's width; the torch waits
+# TORCH_INSET in from the side it is on
+BRIDGE_LEFT = 300
+BRIDGE_RIGHT = 600
+BRIDGE_HALF_HEIGHT = 36
+BRIDGE_LABEL = (450, BRIDGE_Y - 60)
+PERSON_RADIUS = 18
+TORCH_HALF = 10
+TORCH_INSET = 40
+TORCH_START = (LEFT_X + TORCH_INSET, BRIDGE_Y - 10)
+# grid spacing: 40px shows everyone in one labelled column, and crowds shrink
+# it down to MIN_GAP before the scene grows downwards instead
+BASE_GAP = 40
+MIN_GAP = 8
+# below this on-screen spacing the name and time labels are hidden
+LABEL_MIN_GAP = 26
+# animation speed: 700 ms per time unit (clamped), then a pause between steps
+STEP_MS_PER_UNIT = 700
+STEP_MIN_MS = 1000
+STEP_MAX_MS = 9000
+PAUSE_MS = 400
+
+def grid_layout(n, height=360):
+    # largest spacing at which everyone fits in the given height, and each
+    # person's home (x, y) on the start side
+    usable = height - 20
+    for gap in range(BASE_GAP, MIN_GAP - 1, -1):
+        rows_fit = max(1, usable // gap)
+        if rows_fit * max(1, SIDE_WIDTH // gap) >= n:
+            break
+    cols = max(1, min(SIDE_WIDTH // gap, math.ceil(n / rows_fit))) if n else 1
+    rows = math.ceil(n / cols) if n else 0
+    if rows * gap <= usable:
+        y_start = BRIDGE_Y - (rows - 1) * gap / 2
+    else:
+        y_start = 10 + gap / 2
+    x_start = LEFT_X - (cols - 1) * gap / 2
+    homes = [(x_start + (i % cols) * gap, y_start + (i // cols) * gap) for i in range(n)]
+    return gap, homes
+
+class Segment:
+    def __init__(self, start, end, group, direction, distance, torch_from, torch_to):
+        self.start = start
+        self.end = end
+        self.group = group
+        self.direction = direction
+        self.distance = distance
+        self.torch_from = torch_from
+        self.torch_to = torch_to
+
+class Timeline:
+    # where everyone is at any moment of a plan's playback, in milliseconds;
+    # pure data, shared by the Tk animation and the offscreen renderer
+    def __init__(self, steps, homes, speed=1.0):
+        self.homes = homes
+        self.segments = []
+        start = 0
+        torch = TORCH_START
+        for group, direction, t in steps:
+            duration = max(STEP_MIN_MS, min(STEP_MAX_MS, t * STEP_MS_PER_UNIT)) / speed
+            if direction == "->":
+                distance = RIGHT_X - LEFT_X
+                end_x = RIGHT_X - TORCH_INSET
+            else:
+                distance = LEFT_X - RIGHT_X
+                end_x = LEFT_X + TORCH_INSET
+            # torch is centered vertically on the group's average y
+            ys = [homes[g][1] for g in group]
+            torch_to = (end_x, sum(ys) / len(ys) if ys else TORCH_START[1])
+            self.segments.append(Segment(start, start + duration, group, direction, distance, torch, torch_to))
+            torch = torch_to
+            start += duration + PAUSE_MS / speed
+        self.duration = self.segments[-1].end if self.segments else 0
+        self.torch_start = TORCH_START
+
+    def frame(self, ms):
+        # (x of every person, torch (x, y)) at time ms
+        xs = [x for x, _ in self.homes]
+        torch = self.torch_start
+        for seg in self.segments:
+            if ms < seg.start:
+                break
+            p = 1.0 if ms >= seg.end else (ms - seg.start) / (seg.end - seg.start)
+            for g in seg.group:
+                xs[g] += seg.distance * p
+            torch = (seg.torch_from[0] + (seg.torch_to[0] - seg.torch_from[0]) * p, seg.torch_to[1])
+        return xs, torch
+
+    def frames(self, fps):
+        # frame states at a fixed rate, ending exactly on the final layout
+        count = int(self.duration * fps / 1000) + 1
+        for k in range(count):
+            yield self.frame(k * 1000 / fps)
+        if (count - 1) * 1000 / fps < self.duration:
+            yield self.frame(self.duration)